@@ -18,7 +18,9 @@
  Features:
     • Play, Pause, Stop, Next, Previous
     • Progress bar with seek and elapsed time
-    • Playlist load/save in JSON format
+    • Last playlist kept in last_playlist.txt (one path per line), with the
+      tags and durations read so far cached in a meta_cache.json sidecar
+    • "Save playlist as..." / "Load playlist..." in JSON format
     • Drag & drop, folder or file add
     • Move songs up/down in the playlist
     • Context menu with right-click / two-finger click
@@ -45,13 +47,14 @@
 import vlc
 import os
 import json
-import time
 import queue
+import threading
 import platform
 import pathlib
-from mutagen.mp3 import MP3
-from mutagen.easyid3 import EasyID3
-from mutagen import File as MutagenFile
+import functools
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from mutagen import File as MutagenFile, MutagenError
 
 from tkinter import ttk, filedialog
 import tkinter as tk
@@ -60,6 +63,21 @@ import subprocess
 
 # Supported audio extensions (used by dialogs and folder scanning)
 SUPPORTED_EXTS = (".mp3", ".wav", ".flac", ".ogg", ".aac", ".m4a", ".wma")
+# without the dot, as str.rpartition(".") returns it
+SUPPORTED_EXT_SET = frozenset(ext[1:] for ext in SUPPORTED_EXTS)
+
+def is_supported(name):
+    """True if file `name` has a supported audio extension (one split, one set lookup)."""
+    stem, dot, ext = name.rpartition(".")
+    # no dot leaves the stem empty; a bare dotfile such as ".mp3" or "dir/.mp3" has
+    # nothing before the dot. Neither is a track
+    return stem[-1:] not in ("", "/", os.sep) and ext.lower() in SUPPORTED_EXT_SET
+
+# One playlist entry: metadata is read once when the song is added
+Song = namedtuple("Song", "path title artist duration")
+
+# Worker threads used to read tags/durations of many files in parallel
+META_WORKERS = 8
 
 def get_user_data_dir():
     """Get the appropriate user data directory for storing application data."""
@@ -81,159 +99,471 @@ global current_index_playing, index_to_play
 current_index_playing = -1
 index_to_play = -1
 
-def get_audio_duration(filepath):
-    """Try VLC first (works for most formats). Fall back to mutagen if VLC fails."""
+# A single VLC instance shared by every duration probe and player (creating one is costly)
+_VLC_INSTANCE = vlc.Instance("--quiet", "--no-video")
+
+# Memoized durations keyed by (path, mtime_ns, size) so repeated probes are free
+duration_cache = {}
+
+def duration_key(filepath):
+    """Return the (path, mtime_ns, size) memo key for `filepath`, or None if it can't be stat'ed."""
     try:
-        instance = vlc.Instance()
-        media = instance.media_new(filepath)
-        # blocking parse to ensure duration available
-        media.parse()
-        dur_ms = media.get_duration()
-        if dur_ms and dur_ms > 0:
-            return int(dur_ms / 1000)
-    except Exception:
-        pass
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return (filepath, st.st_mtime_ns, st.st_size)
+
+def parse_media(media, timeout_ms):
+    """Run VLC's local parse of `media` and wait until it finishes or times out."""
+    # VLC signals MediaParsedChanged when the parse finishes or times out;
+    # wait on it instead of polling the status
+    parsed = threading.Event()
+    media.event_manager().event_attach(vlc.EventType.MediaParsedChanged,
+                                       lambda event: parsed.set())
+    media.parse_with_options(vlc.MediaParseFlag.local, timeout_ms)
+    parsed.wait(timeout_ms / 1000)
 
-    # Fallback to mutagen (gives length in seconds if supported)
+def get_audio_duration(filepath):
+    """Try mutagen first (header read only). Fall back to VLC if mutagen fails."""
+    key = duration_key(filepath)
+    if key in duration_cache:
+        return duration_cache[key]
+
+    duration = 0
+    # Mutagen gives length in seconds if supported
     try:
         audio = MutagenFile(filepath)
         if audio and hasattr(audio, "info") and getattr(audio.info, "length", None):
-            return int(audio.info.length)
-    except Exception:
+            duration = int(audio.info.length)
+    except (MutagenError, OSError):
         pass
 
-    return 0
-
-def renumber_tree():
-    """Update the 'No.' column to reflect the current order in the tree."""
-    for idx, item in enumerate(tree.get_children(), start=1):
-        values = list(tree.item(item, "values"))
-        values[0] = str(idx)
-        tree.item(item, values=values)
+    # Fallback to VLC (works for most formats), reusing the cached instance
+    if not duration:
+        try:
+            media = _VLC_INSTANCE.media_new(filepath)
+            parse_media(media, 1000)
+            dur_ms = media.get_duration()
+            if dur_ms and dur_ms > 0:
+                duration = int(dur_ms / 1000)
+        except Exception:
+            pass
 
-# --- play marker helpers ---
-def clear_playing_mark():
-    """Remove playing marker (▶) and tags from all rows."""
-    for item in tree.get_children():
-        vals = list(tree.item(item, "values"))
-        if vals and len(vals) > 1 and isinstance(vals[1], str) and vals[1].startswith("▶ "):
-            vals[1] = vals[1][2:]
-            tree.item(item, values=vals)
-        # clear tags for safety
-        tree.item(item, tags=())
+    if key is not None:
+        duration_cache[key] = duration
+    return duration
+
+# tree.get_children() is a Tcl round-trip building a new tuple each time: keep the
+# last result until rows are inserted, deleted or moved
+children_cache = None
+
+def tree_children():
+    """Return the tree's row ids in order (cached until invalidate_children())."""
+    global children_cache
+    if children_cache is None:
+        children_cache = tree.get_children()
+    return children_cache
+
+def invalidate_children():
+    """Forget the cached row ids; call after any insert, delete or move of rows."""
+    global children_cache, row_index_cache
+    children_cache = None
+    row_index_cache = None
+
+# tree.index() walks the row list in Tk; map row id -> position instead, built
+# lazily from tree_children() and dropped together with it
+row_index_cache = None
+
+def row_index(item):
+    """Return the position of row `item` in the tree, or -1 if it is not a row."""
+    global row_index_cache
+    if row_index_cache is None:
+        row_index_cache = {iid: i for i, iid in enumerate(tree_children())}
+    return row_index_cache.get(item, -1)
+
+def renumber_tree(start=0):
+    """Update the 'No.' column from row `start` on; rows above it keep their number."""
+    children = tree_children()
+    for idx in range(start, len(children)):
+        # touch only the 'No.' cell, and only when the number actually changed
+        number = str(idx + 1)
+        if tree.set(children[idx], "No.") != number:
+            tree.set(children[idx], "No.", number)
 
 # --- play marker helpers ---
-def clear_stop_mark():
-    """Remove playing marker (▶) and tags from all rows."""
-    for item in tree.get_children():
-        vals = list(tree.item(item, "values"))
-        if vals and len(vals) > 1 and isinstance(vals[1], str) and vals[1].startswith("■ "):
-            vals[1] = vals[1][2:]
-            tree.item(item, values=vals)
-        # clear tags for safety
-        tree.item(item, tags=())
-
-def mark_pause_item(index):
-    """Mark the row at `index` as pause (add ⏸ prefix + 'playing' tag) and clear others."""
-    children = tree.get_children()
-    if not children:
+# The marker symbol has its own narrow "St" column, so the Title cell is never
+# touched. At most one row carries a marker; remember it so a change writes two cells
+MARK_PLAYING = "▶"
+MARK_PAUSED = "⏸"
+MARK_STOPPED = "■"  # keeps the 'playing' tag/colors on the last played row
+marked_item = None
+marked_symbol = ""
+
+def unmark_item():
+    """Remove the marker symbol and 'playing' tag from the currently marked row."""
+    global marked_item, marked_symbol
+    if marked_item is not None and tree.exists(marked_item):
+        tree.item(marked_item, tags=())
+        tree.set(marked_item, "St", "")
+    marked_item = None
+    marked_symbol = ""
+
+def set_mark(index, symbol):
+    """Mark the row at `index` with `symbol` + 'playing' tag and unmark the previous row."""
+    global marked_item, marked_symbol
+    children = tree_children()
+    if not 0 <= index < len(children):
+        unmark_item()
         return
-    for i, item in enumerate(children):
-        vals = list(tree.item(item, "values"))
-        # ensure there's a title column
-        if not vals or len(vals) < 2:
-            continue
-        if i == index:
-            # remove stop marker if present
-            if vals[1].startswith("▶ ") or vals[1].startswith("⏸ ") or vals[1].startswith("■ "):
-                vals[1] = vals[1][2:]
-            if not vals[1].startswith("⏸ "):
-                vals[1] = "⏸ " + vals[1]
-                tree.item(item, values=vals)
-            tree.item(item, tags=("playing",))
-        else:
-            if vals[1].startswith("▶ ") or vals[1].startswith("⏸ ") or vals[1].startswith("■ "):
-                vals[1] = vals[1][2:]
-                tree.item(item, values=vals)
-            tree.item(item, tags=())
-
-def mark_playing_item(index):
-    """Mark the row at `index` as pause (add ⏸ prefix + 'playing' tag) and clear others."""
-    children = tree.get_children()
-    if not children:
-        return
-    for i, item in enumerate(children):
-        vals = list(tree.item(item, "values"))
-        # ensure there's a title column
-        if not vals or len(vals) < 2:
-            continue
-        if i == index:
-            # remove stop marker if present
-            if vals[1].startswith("▶ ") or vals[1].startswith("⏸ ") or vals[1].startswith("■ "):
-                vals[1] = vals[1][2:]
-            if not vals[1].startswith("▶ "):
-                vals[1] = "▶ " + vals[1]
-                tree.item(item, values=vals)
-            tree.item(item, tags=("playing",))
-        else:
-            if vals[1].startswith("▶ ") or vals[1].startswith("⏸ ") or vals[1].startswith("■ "):
-                vals[1] = vals[1][2:]
-                tree.item(item, values=vals)
-            tree.item(item, tags=())
-
-def add_song_to_list(path):
-    """Add a file to playlist and populate sensible title/artist for many formats."""
-    if not os.path.isfile(path):
+    item = children[index]
+    if item == marked_item and symbol == marked_symbol:
         return
+    if item != marked_item:
+        unmark_item()
+        tree.item(item, tags=("playing",))
+    tree.set(item, "St", symbol)
+    marked_item, marked_symbol = item, symbol
+
+def clear_mark(symbol):
+    """Remove the marker and its tag if the marked row shows `symbol`."""
+    if marked_symbol == symbol:
+        unmark_item()
+
+# Tag keys tried in order: easy mode gives MP3/MP4/FLAC/Ogg the normalized key, the
+# raw keys only matter for formats without an easy mode (ID3 in WAV, ASF/WMA)
+TITLE_KEYS = ("title", "Title", "TIT2", "\xa9nam")
+ARTIST_KEYS = ("artist", "Author", "TPE1", "\xa9ART")
+
+def first_tag(tags, keys):
+    """Return the first value found in `tags` under one of `keys`, as a string, or None."""
+    for k in keys:
+        if k in tags:
+            v = tags[k]
+            try:
+                return str(v[0]) if isinstance(v, (list, tuple)) else str(v)
+            except Exception:
+                return str(v)
+    return None
+
+# Metadata of files seen before, persisted in META_CACHE_FILE between runs:
+# path -> [mtime_ns, size, title, artist, duration]; a changed mtime/size means re-read.
+# Integer nanoseconds round-trip through JSON exactly, unlike a float st_mtime
+meta_cache = {}
+meta_cache_dirty = False
+
+def load_meta_cache():
+    """Merge META_CACHE_FILE into meta_cache (missing or unreadable file: start empty)."""
+    try:
+        with open(META_CACHE_FILE) as f:
+            meta_cache.update(json.load(f))
+    except (OSError, ValueError):
+        pass
 
-    ext = os.path.splitext(path)[1].lower()
-    basename = os.path.basename(path)
+def save_meta_cache():
+    """Write meta_cache to META_CACHE_FILE if it changed, atomically (temp file + rename)."""
+    global meta_cache_dirty
+    if not meta_cache_dirty:
+        return
+    tmp_file = META_CACHE_FILE + ".tmp"
+    try:
+        with open(tmp_file, "w") as f:
+            json.dump(dict(meta_cache), f)
+        os.replace(tmp_file, META_CACHE_FILE)
+        meta_cache_dirty = False
+    except OSError as e:
+        print(f"Error saving metadata cache: {e}")
+
+def read_song_meta(path, basename=None):
+    """Return (title, artist, duration) of `path`: from meta_cache if the file is
+    unchanged, otherwise from a single mutagen parse. Runs on the metadata pool.
+
+    duration is None when mutagen cannot tell; VLC is never used here, insert_songs
+    hands those rows to the single duration worker instead.
+
+    Callers that already know the file name (a directory scan) pass it as `basename`.
+    """
+    global meta_cache_dirty
+    try:
+        st = os.stat(path)
+    except OSError:
+        st = None
+    if st is not None:
+        entry = meta_cache.get(path)
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            return entry[2], entry[3], entry[4]
+
+    if basename is None:
+        basename = os.path.basename(path)
+    ext = os.path.splitext(basename)[1].lower()
     title = basename
     artist = "Unknown"
+    dur = None
 
-    # MP3: prefer EasyID3
-    if ext == ".mp3":
-        try:
-            tags = EasyID3(path)
-            title = tags.get("title", [basename])[0]
-            artist = tags.get("artist", ["Unknown"])[0]
-        except Exception:
-            pass
-    else:
-        # Other formats: use mutagen generic File and try common tag keys
-        try:
-            audio = MutagenFile(path)
-            if audio and audio.tags:
-                # try common keys (many formats provide lists)
-                def first_tag(tags, *keys):
-                    for k in keys:
-                        if k in tags:
-                            v = tags[k]
-                            try:
-                                return v[0] if isinstance(v, (list, tuple)) else str(v)
-                            except Exception:
-                                return str(v)
-                    return None
-
-                t = first_tag(audio.tags, "title", "TITLE", "TIT2", "\xa9nam")
-                a = first_tag(audio.tags, "artist", "ARTIST", "TPE1", "\xa9ART")
-                if t:
-                    title = t
-                if a:
-                    artist = a
-        except Exception:
-            pass
+    # One MutagenFile(easy=True) handle gives tags and duration for every format
+    audio = None
+    try:
+        audio = MutagenFile(path, easy=True)
+        if audio and audio.tags:
+            title = first_tag(audio.tags, TITLE_KEYS) or title
+            artist = first_tag(audio.tags, ARTIST_KEYS) or artist
+    except (MutagenError, OSError):
+        pass
+    except Exception as e:
+        # mutagen raises other errors on some truncated files; one bad file must not
+        # abort the whole batch, so show it by name with an unknown duration
+        print(f"Error reading tags of {path}: {e}")
+        audio = None
+        title, artist = basename, "Unknown"
+
+    if audio and getattr(getattr(audio, "info", None), "length", None):
+        dur = int(audio.info.length)
+        if st is not None:
+            duration_cache[(path, st.st_mtime_ns, st.st_size)] = dur
+    # else: mutagen could not time this file; the duration worker asks VLC later
 
     # Append extension label for non-mp3 files (optional UI hint)
     if ext != ".mp3" and ext:
         title = f"{title} [{ext[1:].upper()}]"
 
-    dur = get_audio_duration(path)
+    if st is not None:
+        meta_cache[path] = [st.st_mtime_ns, st.st_size, title, artist, dur]
+        meta_cache_dirty = True
+    return title, artist, dur
+
+def read_songs(paths):
+    """Return a Song for each of `paths`; touches no Tk state, so safe off the main thread."""
+    if len(paths) > 1:
+        # metadata reads are I/O bound, so overlap them
+        with ThreadPoolExecutor(max_workers=META_WORKERS) as ex:
+            metas = list(ex.map(read_song_meta, paths))
+    else:
+        metas = [read_song_meta(path) for path in paths]
+    return [Song(path, title, artist, dur) for path, (title, artist, dur) in zip(paths, metas)]
+
+def insert_songs(songs):
+    """Append `songs` to the playlist and the tree; main thread only."""
+    start = len(playlist)
+    playlist.extend(songs)
+    if start == 0:
+        # Tk finds "end" by walking the sibling list, index 0 is found at once: fill
+        # an empty tree back to front (same final order, no quadratic walk)
+        for number in range(len(songs), 0, -1):
+            tree.insert("", 0, values=song_row(number, songs[number - 1]))
+    else:
+        for number, song in enumerate(songs, start=start + 1):
+            tree.insert("", "end", values=song_row(number, song))
+    invalidate_children()
+    for iid, song in zip(tree_children()[start:], songs):
+        if song.duration is None:
+            queue_duration(iid, song.path)
+
+@functools.lru_cache(maxsize=None)
+def format_duration(seconds):
+    """Return `seconds` as 'MM:SS'; memoized, since tracks share a small set of lengths."""
+    return f"{seconds//60:02}:{seconds%60:02}"
+
+def song_row(number, song):
+    """Return the Treeview values tuple for `song` shown as row `number` (unmarked)."""
+    shown = NO_DURATION if song.duration is None else format_duration(song.duration)
+    return ("", str(number), song.title, song.artist, shown)
+
+# --- background durations ---
+# Songs mutagen could not time are shown with a placeholder. One dedicated thread,
+# never the metadata pool, probes them with VLC. The same thread parses the Media
+# play_song prefetches, so parses on the shared _VLC_INSTANCE never run
+# concurrently. It does not touch Tk: results go to
+# duration_results, which drain_durations empties on the Tk thread every
+# DURATION_DRAIN_MS while probes are outstanding.
+NO_DURATION = "--:--"
+DURATION_DRAIN_MS = 100
+duration_queue = queue.Queue()    # (row, path) to probe or (None, path) to prefetch; filled on Tk
+duration_results = queue.Queue()  # (row, path, seconds or None), filled by the worker
+durations_pending = 0             # queued probes whose result has not been shown yet
+
+def duration_worker():
+    """Probe the duration of each queued (row, path) and queue the result for Tk."""
+    while True:
+        iid, path = duration_queue.get()
+        if iid is None:
+            parse_prefetch(path)  # no row to update: this is the next song's Media
+            continue
+        try:
+            dur = get_audio_duration(path)
+        except Exception as e:
+            # one bad file must not end the worker: its row just keeps the placeholder
+            print(f"Error reading duration of {path}: {e}")
+            dur = None
+        duration_results.put((iid, path, dur))
+
+def queue_duration(iid, path):
+    """Hand row `iid` to the duration worker and make sure the results get drained (Tk thread)."""
+    global durations_pending
+    duration_queue.put((iid, path))
+    durations_pending += 1
+    if durations_pending == 1:
+        root.after(DURATION_DRAIN_MS, drain_durations)
+
+def drain_durations():
+    """Store and show the durations the worker has read; reschedule while probes are outstanding."""
+    global durations_pending, meta_cache_dirty, current_song_length, total_time_text
+    while True:
+        try:
+            iid, path, dur = duration_results.get_nowait()
+        except queue.Empty:
+            break
+        durations_pending -= 1
+        idx = row_index(iid)
+        if dur is None or idx < 0:
+            continue  # probe failed, or the row was deleted meanwhile
+        playlist[idx] = playlist[idx]._replace(duration=dur)
+        tree.set(iid, "Duration", format_duration(dur))
+        entry = meta_cache.get(path)
+        if entry:
+            entry[4] = dur
+            meta_cache_dirty = True
+        if player is not None and idx == current_index_playing:
+            current_song_length = dur
+            total_time_text = f" / {format_duration(dur)}"
+            progress_bar["maximum"] = dur
+    if durations_pending:
+        root.after(DURATION_DRAIN_MS, drain_durations)
+
+threading.Thread(target=duration_worker, daemon=True).start()
+
+def playlist_paths():
+    """Return the file paths of the playlist, in order, for saving."""
+    return [song.path for song in playlist]
+
+# --- playlist persistence ---
+# Writes are debounced: a burst of edits (e.g. repeated moves) is saved once
+SAVE_DELAY_MS = 500
+save_after_id = None
+
+def schedule_save():
+    """Save the playlist to PLAYLIST_FILE shortly, coalescing saves requested meanwhile."""
+    global save_after_id
+    if save_after_id is not None:
+        root.after_cancel(save_after_id)
+    save_after_id = root.after(SAVE_DELAY_MS, flush_playlist)
+
+def flush_playlist():
+    """Write the playlist to PLAYLIST_FILE now, atomically (temp file + rename), and
+    the metadata cache with it if new files were read."""
+    global save_after_id
+    if save_after_id is not None:
+        root.after_cancel(save_after_id)
+        save_after_id = None
+    tmp_file = PLAYLIST_FILE + ".tmp"
+    try:
+        # one path per line: no JSON encoding/escaping for a flat list of paths
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(playlist_paths()))
+        os.replace(tmp_file, PLAYLIST_FILE)
+    except OSError as e:
+        print(f"Error saving playlist: {e}")
+    save_meta_cache()
+
+def on_close():
+    """Flush a pending playlist save and the metadata cache before the window closes."""
+    if save_after_id is not None:
+        flush_playlist()
+    save_meta_cache()
+    root.destroy()
+
+def iter_audio_files(folder):
+    """Yield (path, name) of supported audio files under `folder`, sorted: its files
+    first, then sub-folders.
+
+    os.scandir's entries carry the file type from the directory read, so no extra
+    stat is needed per entry (os.walk + os.path.isfile did two). Sub-folders go on
+    an explicit stack instead of recursing, so deep trees cost no generator chain.
+    """
+    stack = [folder]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        subfolders = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subfolders.append(entry.path)
+            elif entry.is_file() and is_supported(entry.name):
+                yield entry.path, entry.name
+        # pushed in reverse so sub-folders are visited in name order
+        stack.extend(reversed(subfolders))
+
+# Folder scans and playlist loads run on worker threads and hand their Songs to Tk
+# through scan_queue; the main thread drains it every SCAN_DRAIN_MS, inserting at most
+# SCAN_BATCH rows a tick
+SCAN_DRAIN_MS = 50
+SCAN_BATCH = 200
+scan_queue = queue.Queue()
+scans_running = 0
+scan_added = False  # some scan since the last drain finish inserted rows
+
+def scan_folder(folder):
+    """Worker: read every audio file under `folder` in parallel and queue the Songs in order."""
+    try:
+        files = list(iter_audio_files(folder))
+        paths = [path for path, name in files]
+        names = [name for path, name in files]
+        with ThreadPoolExecutor(max_workers=META_WORKERS) as ex:
+            for path, (title, artist, dur) in zip(paths, ex.map(read_song_meta, paths, names)):
+                scan_queue.put(Song(path, title, artist, dur))
+    finally:
+        scan_queue.put(None)  # end of this scan, so the drain loop can stop
+
+def read_files(paths):
+    """Worker: queue the Songs of those `paths` that are files, in the order given."""
+    try:
+        for song in read_songs([path for path in paths if os.path.isfile(path)]):
+            scan_queue.put(song)
+    finally:
+        scan_queue.put(None)  # end of this "scan", so the drain loop can stop
+
+def start_scan(target, *args):
+    """Run the worker `target` on its own thread and drain its Songs as they arrive (Tk thread)."""
+    global scans_running
+    threading.Thread(target=target, args=args, daemon=True).start()
+    scans_running += 1
+    if scans_running == 1:
+        root.after(SCAN_DRAIN_MS, drain_scan_queue)
+
+def drain_scan_queue():
+    """Insert the next batch of scanned songs; reschedule until every scan has finished."""
+    global scans_running, scan_added
+    batch = []
+    while len(batch) < SCAN_BATCH:
+        try:
+            song = scan_queue.get_nowait()
+        except queue.Empty:
+            break
+        if song is None:
+            scans_running -= 1
+        else:
+            batch.append(song)
+    if batch:
+        insert_songs(batch)
+        scan_added = True
+    if scans_running:
+        root.after(SCAN_DRAIN_MS, drain_scan_queue)
+        return
+    if not scan_added:
+        return  # nothing new: keep the saved playlist and the selection as they are
+    scan_added = False
+
+    # persist playlist
+    schedule_save()
 
-    playlist.append(path)
-    number_of_songs = len(tree.get_children())
-    tree.insert("", "end", values=(str(number_of_songs + 1), title, artist, f"{dur//60:02}:{dur%60:02}"))
-    renumber_tree()
+    # Select the first song if available
+    children = tree_children()
+    if children:
+        first_item = children[0]
+        tree.selection_set(first_item)
+        tree.focus(first_item)
+        tree.see(first_item)
 
 def add_folder():
     global last_opened_folder
@@ -244,31 +574,14 @@ def add_folder():
     #playlist.clear()
     #tree.delete(*tree.get_children())
 
-    # Walk folder recursively and add supported files in a stable order
-    for root_dir, dirs, files in os.walk(folder):
-        dirs.sort()
-        for file in sorted(files):
-            if file.lower().endswith(SUPPORTED_EXTS):
-                path = os.path.join(root_dir, file)
-                add_song_to_list(path)
-
     # remember last opened folder
     last_opened_folder = folder
 
-    # update numbers and persist playlist
-    renumber_tree()
-    with open(PLAYLIST_FILE, "w") as f:
-        json.dump({"playlist": playlist}, f)
-
     if player:
         stop_song()
 
-    # Select the first song if available
-    if tree.get_children():
-        first_item = tree.get_children()[0]
-        tree.selection_set(first_item)
-        tree.focus(first_item)
-        tree.see(first_item)
+    # Walk folder recursively off the Tk thread; rows arrive as they are read
+    start_scan(scan_folder, folder)
 
 def add_songs():
     global last_opened_folder
@@ -282,55 +595,88 @@ def add_songs():
         return
     # Remember the folder of the first selected file
     last_opened_folder = os.path.dirname(song_tmp[0])
-    for file in sorted(song_tmp):
-        if file.lower().endswith(SUPPORTED_EXTS):
-            add_song_to_list(file)
-    renumber_tree()
-    json.dump({"playlist": playlist}, open(PLAYLIST_FILE, "w"))
+    # tags are read off the Tk thread like a folder's; drain_scan_queue saves the playlist
+    start_scan(read_files, [file for file in sorted(song_tmp) if is_supported(file)])
 
 def clear_songs_list():
     if player:
         stop_song()
-    playlist.clear(); tree.delete(*tree.get_children())
-    json.dump({"playlist": playlist}, open(PLAYLIST_FILE, "w"))
+    playlist.clear(); tree.delete(*tree_children())
+    invalidate_children()
+    schedule_save()
 
 def load_saved_playlist():
-    if not os.path.exists(PLAYLIST_FILE):
-        return
+    """Read the saved playlist on a worker thread so the window shows up right away;
+    its songs arrive through scan_queue like a folder scan's."""
+    start_scan(read_saved_playlist)
+
+def read_saved_paths():
+    """Return the paths in PLAYLIST_FILE, or in the JSON file older versions saved."""
+    if os.path.exists(PLAYLIST_FILE):
+        with open(PLAYLIST_FILE, encoding="utf-8") as f:
+            return [line.rstrip("\n") for line in f if line.strip()]
+    if os.path.exists(LEGACY_PLAYLIST_FILE):
+        with open(LEGACY_PLAYLIST_FILE) as f:
+            return json.load(f).get("playlist", [])
+    return []
+
+def read_saved_playlist():
+    """Worker: load the metadata cache, read the saved playlist and queue its songs for Tk."""
     try:
-        data = json.load(open(PLAYLIST_FILE))
-        for path in data.get("playlist", []):
-            if os.path.exists(path):
-                add_song_to_list(path)
-    except Exception:
-        pass
-
-    json.dump({"playlist": playlist}, open(PLAYLIST_FILE, "w"))
-
-    # 👇 Select the first song if available
-    if tree.get_children():
-        first_item = tree.get_children()[0]
-        tree.selection_set(first_item)
-        tree.focus(first_item)
-        tree.see(first_item)
-
-def play_selected():
+        load_meta_cache()
+        try:
+            songs = read_songs([path for path in read_saved_paths() if os.path.exists(path)])
+        except (OSError, ValueError):  # unreadable, not UTF-8 or not JSON
+            songs = []
+        for song in songs:
+            scan_queue.put(song)
+    finally:
+        scan_queue.put(None)  # end of this "scan", so the drain loop can stop
+
+def play_selected(event=None):
     global current_index, index_to_play, current_index_playing
     sel = tree.selection()
     if sel:
-        current_index = tree.index(sel[0])
+        current_index = row_index(sel[0])
         
     if paused and current_index_playing == current_index:
         pause_song()
-        wait_for_playing_and_update()
         return
     
     if sel:
         index_to_play = current_index
         play_song()
         
+# The next song's Media is created and parsed by the duration worker while the current
+# one plays, so a skip or the move to the next song starts from a warm Media
+prefetched_media = None  # (path, vlc.Media) of the song after the playing one
+
+def prefetch_media(path):
+    """Ask the duration worker to prepare the Media for `path` (Tk thread)."""
+    duration_queue.put((None, path))
+
+def parse_prefetch(path):
+    """Worker: create and parse the Media for `path`, replacing any earlier one."""
+    global prefetched_media
+    try:
+        media = _VLC_INSTANCE.media_new(path)
+        parse_media(media, 2000)
+    except Exception as e:
+        print(f"Error prefetching {path}: {e}")
+        return
+    prefetched_media = (path, media)
+
+def take_media(path):
+    """Return the prefetched Media if it is for `path`, otherwise a new one."""
+    global prefetched_media
+    prefetched = prefetched_media  # read once: the worker may replace it meanwhile
+    if prefetched is not None and prefetched[0] == path:
+        prefetched_media = None
+        return prefetched[1]
+    return _VLC_INSTANCE.media_new(path)
+
 def play_song():
-    global player, current_song_length, current_index_playing, index_to_play
+    global player, current_song_length, total_time_text, current_index_playing, index_to_play
     try:
         if player and player.get_state() == vlc.State.Playing and current_index_playing == index_to_play:
             return
@@ -338,33 +684,42 @@ def play_song():
         pass
     
     stop_song()
-    clear_stop_mark()
     if index_to_play < 0:
         index_to_play = current_index
     current_index_playing = index_to_play
     song = playlist[current_index_playing]
     
     try:
-        player = vlc.MediaPlayer(song)
+        player = _VLC_INSTANCE.media_player_new()
+        player.set_media(take_media(song.path))
+        # VLC reports state changes on its own thread: queue them for the Tk thread
+        events = player.event_manager()
+        events.event_attach(vlc.EventType.MediaPlayerPlaying,
+                            lambda event, p=player: vlc_events.put((on_song_playing, p)))
+        events.event_attach(vlc.EventType.MediaPlayerEndReached,
+                            lambda event, p=player: vlc_events.put((on_song_end, p)))
+        events.event_attach(vlc.EventType.MediaPlayerTimeChanged, time_changed_handler(player))
         player.audio_set_volume(int(volume_slider.get()))
         player.play()
+        start_vlc_poll()
     except Exception as e:
         print(f"Error creating/playing media: {e}")
         player = None
         return
-    
-    try:
-        audio = MP3(song)
-    except Exception:
-        pass
 
-    current_song_length = get_audio_duration(song)
+    # duration was read when the song was added: no re-parse on play (0 until the
+    # duration worker has timed a file mutagen could not)
+    current_song_length = song.duration or 0
+    total_time_text = f" / {format_duration(current_song_length)}"  # constant per song
     progress_bar["maximum"] = current_song_length
 
-    label_var.set(f"🎵 Now playing: {os.path.basename(song)}")
-    wait_for_playing_and_update()
-    check_song_end()
-    mark_playing_item(current_index_playing)
+    # the new song replaces the stopped display stop_song() queued above
+    cancel_stopped_ui()
+    show_progress(0, "")
+    label_var.set(f"🎵 Now playing: {os.path.basename(song.path)}")
+    set_mark(current_index_playing, MARK_PLAYING)
+    if len(playlist) > 1:
+        prefetch_media(playlist[(current_index_playing + 1) % len(playlist)].path)
 
 def pause_song():
     global paused
@@ -374,81 +729,139 @@ def pause_song():
             paused = not paused
 
             if paused:
-                mark_pause_item(current_index_playing)
+                set_mark(current_index_playing, MARK_PAUSED)
             else:
-                mark_playing_item(current_index_playing)
-                wait_for_playing_and_update()
+                set_mark(current_index_playing, MARK_PLAYING)
+                start_vlc_poll()
         except Exception as e:
             print(f"Error in pause_song: {e}")
 
-def mark_stopped_item(index):
-    """Mark the row at `index` as stopped (■ prefix) but keep the same tag/colors."""
-    children = tree.get_children()
-    if not children:
-        return
-    for i, item in enumerate(children):
-        vals = list(tree.item(item, "values"))
-        if not vals or len(vals) < 2:
-            continue
-        if i == index:
-            # remove playing marker if present
-            if vals[1].startswith("▶ ") or vals[1].startswith("⏸ ") or vals[1].startswith("■ "):
-                vals[1] = vals[1][2:]
-            # add stopped marker if not present
-            if not vals[1].startswith("■ "):
-                vals[1] = "■ " + vals[1]
-                tree.item(item, values=vals)
-            # keep the same visual tag so colors remain
-            tree.item(item, tags=("playing",))
-        else:
-            # remove stopped marker from other rows
-            if vals[1].startswith("▶ ") or vals[1].startswith("⏸ ") or vals[1].startswith("■ "):
-                vals[1] = vals[1][2:]
-                tree.item(item, values=vals)
-            tree.item(item, tags=())
-
 def stop_song():
-    global paused
+    global paused, progress_player
     paused = False
     if player:
         try:
             player.stop()
         except Exception as e:
             print(f"Error stopping player: {e}")
-    progress_bar['value'] = 0
-    label_var.set("⏹ Stopped")
-    time_label.config(text="")
-    # keep the same background/foreground for the last played item
-    clear_playing_mark()
+    progress_player = None
+    schedule_stopped_ui()
+    # keep the same background/foreground for the last played item; set_mark moves
+    # the single marker, so no separate clear is needed first
     if 0 <= current_index_playing < len(playlist):
-        mark_stopped_item(current_index_playing)
+        set_mark(current_index_playing, MARK_STOPPED)
+    else:
+        clear_mark(MARK_PLAYING)
+
+# stop_song() resets the progress and status label when Tk is next idle, so a burst
+# of stops (holding Next, play_song's own stop) redraws once, or not at all
+stopped_ui_after_id = None
+
+def schedule_stopped_ui():
+    """Show the stopped state (empty progress, '⏹ Stopped') once Tk is idle."""
+    global stopped_ui_after_id
+    if stopped_ui_after_id is None:
+        stopped_ui_after_id = root.after_idle(show_stopped_ui)
+
+def cancel_stopped_ui():
+    """Drop a pending stopped-state redraw (a new song has started meanwhile)."""
+    global stopped_ui_after_id
+    if stopped_ui_after_id is not None:
+        root.after_cancel(stopped_ui_after_id)
+        stopped_ui_after_id = None
+
+def show_stopped_ui():
+    global stopped_ui_after_id
+    stopped_ui_after_id = None
+    show_progress(0, "")
+    label_var.set("⏹ Stopped")
 
 def skip(step):
     global index_to_play
     index_to_play = (index_to_play + step) % len(playlist)
     play_song()
 
-def update_progress():
-    if player is not None and player.get_state() == vlc.State.Playing:
-        pos = int(player.get_time() / 1000)
+# Last values pushed to the progress widgets, to skip redundant Tk calls
+last_progress_pos = None
+last_time_text = None
+
+def show_progress(pos, text):
+    """Update progress bar and time label, touching only the widgets whose value changed."""
+    global last_progress_pos, last_time_text
+    if pos != last_progress_pos:
         progress_bar['value'] = pos
-        #print("progress_bar value set to ", pos)
-
-        minutes = pos // 60
-        seconds = pos % 60
-        total = current_song_length
-        total_minutes = total // 60
-        total_seconds = total % 60
-
-        time_label.config(text=f"{minutes:02}:{seconds:02} / {total_minutes:02}:{total_seconds:02}")
-
-        if pos < total:
-            root.after(1000, update_progress)
-    elif player and player.get_state() == vlc.State.Ended:
-        progress_bar['value'] = 0
-        time_label.config(text="")
-        if not paused and current_index_playing < len(playlist) - 1:
-            skip(1)
+        last_progress_pos = pos
+    if text != last_time_text:
+        time_label.config(text=text)
+        last_time_text = text
+
+# VLC's callbacks run on its own threads and must never call Tk: a Tk call from there
+# waits for the main loop, while player.stop() on the Tk thread waits for VLC's
+# thread, and the app would hang. They only queue (handler, *args) in vlc_events;
+# drain_vlc_events runs the handlers on the Tk thread while a player is active.
+VLC_POLL_MS = 100
+vlc_events = queue.Queue()
+vlc_poll_after_id = None
+
+def start_vlc_poll():
+    """Arm the vlc_events drain unless it is already running (play/resume)."""
+    global vlc_poll_after_id
+    if vlc_poll_after_id is None:
+        vlc_poll_after_id = root.after(VLC_POLL_MS, drain_vlc_events)
+
+def drain_vlc_events():
+    """Run the queued VLC event handlers; keep polling while the player can send more."""
+    global vlc_poll_after_id
+    vlc_poll_after_id = None
+    while True:
+        try:
+            handler, *args = vlc_events.get_nowait()
+        except queue.Empty:
+            break
+        try:
+            handler(*args)
+        except Exception as e:
+            print(f"Error handling VLC event: {e}")
+    # paused or stopped players send nothing until play/resume re-arms the poll; an
+    # Ended player keeps it armed until its EndReached has been handled
+    p = player
+    if p is not None and not paused and p.get_state() not in (vlc.State.Stopped, vlc.State.Error):
+        start_vlc_poll()
+
+# VLC's TimeChanged events drive the progress (through vlc_events).
+# progress_player is the player whose events are shown (None once stopped or ended)
+progress_player = None
+ui_active = True  # False while the main window is minimized / unmapped
+
+def time_changed_handler(playing_player):
+    """Return a TimeChanged callback for `playing_player` that queues once per second.
+
+    VLC fires TimeChanged several times a second on its own thread; the display only
+    shows whole seconds, so the other events are dropped before they are queued.
+    """
+    last_second = -1
+    def on_time_changed(event):
+        nonlocal last_second
+        second = event.u.new_time // 1000
+        if second != last_second:
+            last_second = second
+            vlc_events.put((on_song_time, playing_player, second))
+    return on_time_changed
+
+def show_position(pos):
+    """Show `pos` seconds of the current song on the progress bar and time label."""
+    show_progress(pos, format_duration(pos) + total_time_text)
+
+def update_progress():
+    """Show the playing position now (on start/resume, and when the window is shown)."""
+    if player is None or not ui_active:
+        return
+    show_position(int(player.get_time() / 1000))
+
+def on_song_time(playing_player, pos):
+    """TimeChanged from `playing_player`, one per second: show it unless stale or hidden."""
+    if playing_player is progress_player and ui_active:
+        show_position(pos)
 
 def seek_progress(e):
     if player:
@@ -460,37 +873,43 @@ def seek_progress(e):
         set_time = int(current_song_length * percent) * 1000
         #print("Set song time to ", set_time)
         player.set_time(set_time)
+        # show the new position right away, even while paused
+        show_position(set_time // 1000)
+
+def on_window_unmap(event):
+    """Stop refreshing the progress while the window is minimized."""
+    global ui_active
+    if event.widget is root:
+        ui_active = False
+
+def on_window_map(event):
+    """Catch the progress up when the window is shown again."""
+    global ui_active
+    if event.widget is root and not ui_active:
+        ui_active = True
+        if player and not paused:
+            update_progress()
+
+def on_song_playing(playing_player):
+    """Show progress once `playing_player` has actually started (or resumed)."""
+    global progress_player
+    if playing_player is player:
+        progress_player = playing_player
         update_progress()
 
-def wait_for_playing_and_update():
-    if player is not None and player.get_state() == vlc.State.Playing:
-        update_progress()
-    else:
-        root.after(200, wait_for_playing_and_update)  # Retry in 200 ms
-
-def check_song_end():
-    global player, current_index_playing
-    if player is not None:
-        state = player.get_state()
-        if state == vlc.State.Ended:
-            progress_bar['value'] = 0
-            time_label.config(text="")
-            if not paused:
-                if current_index_playing < len(playlist) - 1:
-                    skip(1)
-                else:
-                    # Last track finished — stop playback and mark item stopped.
-                    try:
-                        stop_song()
-                    except Exception:
-                        pass
-                    if 0 <= current_index_playing < len(playlist):
-                        try:
-                            mark_stopped_item(current_index_playing)
-                        except Exception:
-                            pass
-            return
-    root.after(1000, check_song_end)
+def on_song_end(ended_player):
+    """Play the next song (or stop after the last one) when `ended_player` reaches the end."""
+    global progress_player
+    if ended_player is not player:
+        return  # late event from a player that has been replaced since
+    progress_player = None
+    show_progress(0, "")
+    if not paused:
+        if current_index_playing < len(playlist) - 1:
+            skip(1)
+        else:
+            # Last track finished — stop playback and mark item stopped.
+            stop_song()
 
 def delete_current_song():
     global player, current_index, current_index_playing
@@ -498,7 +917,7 @@ def delete_current_song():
     sel = tree.selection()
     if not sel:
         return
-    idx = tree.index(sel[0])
+    idx = row_index(sel[0])
     if idx < 0 or idx >= len(playlist):
         return
 
@@ -510,7 +929,9 @@ def delete_current_song():
 
     del playlist[idx]
     tree.delete(sel[0])
-    renumber_tree()
+    invalidate_children()
+    # only the rows after the deleted one moved up
+    renumber_tree(idx)
 
     # adjust playing index if it was after deleted index
     if player is not None and current_index_playing > idx:
@@ -522,7 +943,7 @@ def delete_current_song():
         current_index = new_index
         if was_playing_deleted:
             current_index_playing = current_index
-        item = tree.get_children()[current_index]
+        item = tree_children()[current_index]
         tree.selection_set(item)
         tree.focus(item)
         tree.see(item)
@@ -530,7 +951,7 @@ def delete_current_song():
         current_index = 0
         current_index_playing = 0
 
-    json.dump({"playlist": playlist}, open(PLAYLIST_FILE, "w"))
+    schedule_save()
 
 def save_playlist_as():
     file_path = filedialog.asksaveasfilename(
@@ -540,7 +961,7 @@ def save_playlist_as():
     )
     if file_path:
         with open(file_path, "w") as f:
-            json.dump({"playlist": playlist}, f)
+            f.write(json.dumps({"playlist": playlist_paths()}))  # one write, not one per token
 
 def load_playlist_from_file():
     file_path = filedialog.askopenfilename(
@@ -551,20 +972,15 @@ def load_playlist_from_file():
     if file_path:
         try:
             with open(file_path, "r") as f:
-                data = json.load(f)
-                playlist.clear()
-                tree.delete(*tree.get_children())
-                for path in data.get("playlist", []):
-                    add_song_to_list(path)
+                paths = json.load(f).get("playlist", [])
         except Exception as e:
             ttk.messagebox.showerror("Error", f"Failed to load playlist:\n{e}")
-
-        # Select the first song if available
-        if tree.get_children():
-            first_item = tree.get_children()[0]
-            tree.selection_set(first_item)
-            tree.focus(first_item)
-            tree.see(first_item)
+            return
+        playlist.clear()
+        tree.delete(*tree_children())
+        invalidate_children()
+        # the tags are read off the Tk thread; drain_scan_queue selects the first song
+        start_scan(read_files, paths)
 
 def move_song(old_index, new_index):
     """Move song in playlist and reorder the Treeview. Keep selection/play indexes in sync."""
@@ -579,16 +995,15 @@ def move_song(old_index, new_index):
     item = playlist.pop(old_index)
     playlist.insert(new_index, item)
 
-    # capture current tree values and reorder
-    values = [list(tree.item(c, "values")) for c in tree.get_children()]
-    moved_vals = values.pop(old_index)
-    values.insert(new_index, moved_vals)
+    # move the row in place: its item id, values and marker travel with it
+    item_id = tree_children()[old_index]
+    tree.move(item_id, "", new_index)
+    invalidate_children()
 
-    # rebuild tree from reordered values
-    tree.delete(*tree.get_children())
-    for i, vals in enumerate(values, start=1):
-        vals[0] = str(i)
-        tree.insert("", "end", values=vals)
+    # only the rows between the old and new position change number
+    children = tree_children()
+    for i in range(min(old_index, new_index), max(old_index, new_index) + 1):
+        tree.set(children[i], "No.", str(i + 1))
 
     # adjust selection index
     if current_index == old_index:
@@ -606,72 +1021,90 @@ def move_song(old_index, new_index):
     elif new_index <= current_index_playing < old_index:
         current_index_playing += 1
 
-    renumber_tree()
-
-    # restore selection and focus
-    if tree.get_children():
-        #sel_index = max(0, min(current_index, len(tree.get_children()) - 1))
-        item_id = tree.get_children()[new_index]
-        tree.selection_set(item_id)
-        tree.focus(item_id)
-        tree.see(item_id)
-
-    # update visual markers
-    if player is not None:
-        # there's an active player; mark playing item
-        if 0 <= current_index_playing < len(playlist):
-            mark_playing_item(current_index_playing)
-        else:
-            clear_playing_mark()
-    else:
-        # no active player: keep stopped marker if applicable
-        clear_stop_mark()
-        if 0 <= current_index_playing < len(playlist):
-            mark_stopped_item(current_index_playing)
+    # keep the moved row selected and visible
+    tree.selection_set(item_id)
+    tree.focus(item_id)
+    tree.see(item_id)
 
     # persist playlist
-    with open(PLAYLIST_FILE, "w") as f:
-        json.dump({"playlist": playlist}, f)
+    schedule_save()
 
 
-def move_selected_up():
+def move_selected_up(event=None):
     print("move_selected_up called")
     sel = tree.selection()
     if not sel:
         return
-    children = list(tree.get_children())
-    try:
-        idx = children.index(sel[0])
-    except ValueError:
+    idx = row_index(sel[0])
+    if idx < 0:
         return
     if idx > 0:
         move_song(idx, idx - 1)
 
-def move_selected_down():
+def move_selected_down(event=None):
     print("move_selected_down called")
     sel = tree.selection()
     if not sel:
         return
-    children = list(tree.get_children())
-    try:
-        idx = children.index(sel[0])
-    except ValueError:
+    idx = row_index(sel[0])
+    if idx < 0:
         return
     if idx < len(playlist) - 1:
         move_song(idx, idx + 1)
 
+# held Ctrl-key moves arrive at the key-repeat rate; sum them and move once per idle
+pending_move = 0
+
+def schedule_move(delta):
+    global pending_move
+    if pending_move == 0:
+        root.after_idle(apply_pending_move)
+    pending_move += delta
+
+def apply_pending_move():
+    global pending_move
+    delta, pending_move = pending_move, 0
+    sel = tree.selection()
+    if not sel or delta == 0:
+        return
+    idx = row_index(sel[0])
+    if idx < 0:
+        return
+    move_song(idx, max(0, min(len(playlist) - 1, idx + delta)))
+
+def move_up_key(event):
+    schedule_move(-1)
+
+def move_down_key(event):
+    schedule_move(1)
+
 # === Context Menu ===
+context_menu = None  # built on first use
+
 def show_context_menu(event):
+    global context_menu
     # Select the row under mouse
     row_id = tree.identify_row(event.y)
     if row_id:
         tree.selection_set(row_id)
-        context_menu.tk_popup(event.x_root, event.y_root)
+        if context_menu is None:
+            context_menu = tk.Menu(root, tearoff=0)
+            context_menu.add_command(label="Delete from list", command=delete_current_song)
+            context_menu.add_command(label="Move up", command=move_selected_up)
+            context_menu.add_command(label="Move down", command=move_selected_down)
+        try:
+            context_menu.tk_popup(event.x_root, event.y_root)
+        finally:
+            # don't let the menu keep the input grab after it is dismissed
+            context_menu.grab_release()
 
 
 
-PLAYLIST_FILE = str(get_user_data_dir() / "last_playlist.json")
+PLAYLIST_FILE = str(get_user_data_dir() / "last_playlist.txt")
+LEGACY_PLAYLIST_FILE = str(get_user_data_dir() / "last_playlist.json")  # read once, on upgrade
+META_CACHE_FILE = str(get_user_data_dir() / "meta_cache.json")
 playlist, current_index, paused, player, current_song_length = [], 0, False, None, 0
+total_time_text = ""  # " / MM:SS" of the current song, appended to the elapsed time
 last_opened_folder = os.path.expanduser("~")  # Default to home folder
 
 # === Setup GUI ===
@@ -693,10 +1126,11 @@ root.minsize(750, 500)
 tree_frame = ttk.Frame(root)
 tree_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=(10, 5))
 
-columns = ("No.", "Title", "Artist", "Duration")
+columns = ("St", "No.", "Title", "Artist", "Duration")
 tree = ttk.Treeview(tree_frame, columns=columns, show="headings", selectmode="browse")
 for col in columns:
     tree.heading(col, text=col)
+tree.column("St", width=24, anchor='center', stretch=False)
 tree.column("No.", width=40)
 tree.column("Title", width=300)
 tree.column("Artist", width=180)
@@ -708,7 +1142,7 @@ tree.tag_configure("playing", background="#6A6153", foreground="#8dff96")
 
 scroll = ttk.Scrollbar(tree_frame, orient="vertical", command=tree.yview)
 tree.configure(yscrollcommand=scroll.set)
-tree.bind("<Double-1>", lambda e: play_selected())
+tree.bind("<Double-1>", play_selected)
 tree.grid(row=0, column=0, sticky="nsew")
 scroll.grid(row=0, column=1, sticky='ns')
 tree_frame.grid_rowconfigure(0, weight=1)
@@ -721,7 +1155,7 @@ ttk.Label(root, textvariable=label_var).pack(pady=(5, 5))
 # === Progress + Time ===
 progress_bar = ttk.Progressbar(root, orient="horizontal", length=600, mode="determinate")
 progress_bar.pack(pady=4)
-progress_bar.bind("<Button-1>", lambda e: seek_progress(e))
+progress_bar.bind("<Button-1>", seek_progress)
 
 time_label = ttk.Label(root, text="")
 time_label.pack()
@@ -767,54 +1201,41 @@ ttk.Label(vol_frame, textvariable=volume_percent).pack(side=tk.LEFT, padx=6)
 btn2_frame = ttk.Frame(root)
 btn2_frame.pack(pady=12)
 
-# make all six control buttons the same visual width
+# make all control buttons the same visual width
 BTN2_WIDTH = 12
+ttk.Style(root).configure("Ctl.TButton", width=BTN2_WIDTH)
 
-# === Load Folder Button ===
-ttk.Button(btn2_frame, text="Add folder", command=lambda: add_folder(), width=BTN2_WIDTH
-           ).grid(row=0, column=0, padx=2)
+BUTTONS = [
+    ("Add folder", add_folder, 0, 0),
+    ("Add songs", add_songs, 0, 1),
+    ("Delete", delete_current_song, 0, 2),
+    ("Clear", clear_songs_list, 0, 3),
+    ("Save playlist as...", save_playlist_as, 1, 0),
+    ("Load playlist...", load_playlist_from_file, 1, 1),
+    ("Move up", move_selected_up, 1, 2),
+    ("Move down", move_selected_down, 1, 3),
+]
 
-# === Add Songs Button ===
-ttk.Button(btn2_frame, text="Add songs", command=lambda: add_songs(), width=BTN2_WIDTH
-           ).grid(row=0, column=1, padx=2)
+for text, cmd, r, c in BUTTONS:
+    ttk.Button(btn2_frame, text=text, command=cmd, style="Ctl.TButton"
+               ).grid(row=r, column=c, padx=2)
 
-# === Clear Button ===
-ttk.Button(btn2_frame, text="Delete", command=lambda: delete_current_song(), width=BTN2_WIDTH
-           ).grid(row=0, column=2, padx=2)
 
-# === Clear Button ===
-ttk.Button(btn2_frame, text="Clear", command=lambda: clear_songs_list(), width=BTN2_WIDTH
-           ).grid(row=0, column=3, padx=2)
-
-# === Save Playlist Button ===
-ttk.Button(btn2_frame, text="Save playlist as...", command=save_playlist_as, width=BTN2_WIDTH
-           ).grid(row=1, column=0, padx=2)
-
-# === Load Playlist Button ===
-ttk.Button(btn2_frame, text="Load playlist...", command=load_playlist_from_file, width=BTN2_WIDTH
-           ).grid(row=1, column=1, padx=2)
-
-# === Move Up / Move Down Buttons ===
-ttk.Button(btn2_frame, text="Move up", command=lambda: move_selected_up(), width=BTN2_WIDTH
-           ).grid(row=1, column=2, padx=2)
-ttk.Button(btn2_frame, text="Move down", command=lambda: move_selected_down(), width=BTN2_WIDTH
-           ).grid(row=1, column=3, padx=2)
-
-
-context_menu = tk.Menu(root, tearoff=0)
-context_menu.add_command(label="Delete from list", command=lambda: delete_current_song())
-context_menu.add_command(label="Move up", command=lambda: move_selected_up())
-context_menu.add_command(label="Move down", command=lambda: move_selected_down())
-
-tree.bind("<Button-2>", show_context_menu)  # Two finger click on Mac
-tree.bind("<Button-3>", show_context_menu)  # Right-click on Windows/Linux
-tree.bind("<Control-Button-1>", show_context_menu)  # Ctrl+Click on Mac
+# two finger click on Mac, right-click on Windows/Linux, Ctrl+Click on Mac
+tree.event_add("<<ShowMenu>>", "<Button-2>", "<Button-3>", "<Control-Button-1>")
+tree.bind("<<ShowMenu>>", show_context_menu)
 
 # keyboard shortcuts for quick reordering
-root.bind_all("<Control-u>", lambda e: move_selected_up())
-root.bind_all("<Control-d>", lambda e: move_selected_down())
+root.bind_all("<Control-u>", move_up_key)
+root.bind_all("<Control-d>", move_down_key)
 # macOS sleep listener support removed
 
+root.protocol("WM_DELETE_WINDOW", on_close)
+
+# no progress redraws while the window is minimized
+root.bind("<Unmap>", on_window_unmap)
+root.bind("<Map>", on_window_map)
+
 # === Start ===
 load_saved_playlist()
 
@@ -45,14 +45,15 @@
 import vlc
 import os
 import json
-import time
-from mutagen.mp3 import MP3
-from mutagen.easyid3 import EasyID3
-from mutagen import File as MutagenFile
+import threading
+import queue
+import functools
+from mutagen import File as MutagenFile, MutagenError
+from concurrent.futures import ThreadPoolExecutor
 
 import objc
 from Foundation import NSObject
-from Cocoa import NSWorkspace
+from Cocoa import NSWorkspace, NSWorkspaceWillSleepNotification
 from tkinter import ttk, filedialog
 import tkinter as tk
 import sys
@@ -60,6 +61,18 @@ import subprocess
 
 # Supported audio extensions (used by dialogs and folder scanning)
 SUPPORTED_EXTS = (".mp3", ".wav", ".flac", ".ogg", ".aac", ".m4a", ".wma")
+# without the dot, as str.rpartition(".") returns it
+SUPPORTED_EXT_SET = frozenset(ext[1:] for ext in SUPPORTED_EXTS)
+
+def is_supported(name):
+    """True if file `name` has a supported audio extension (one split, one set lookup)."""
+    stem, dot, ext = name.rpartition(".")
+    # no dot leaves the stem empty; a bare dotfile such as ".mp3" or "dir/.mp3" has
+    # nothing before the dot. Neither is a track
+    return stem[-1:] not in ("", "/", os.sep) and ext.lower() in SUPPORTED_EXT_SET
+
+# Worker threads used to read tags/durations of a folder's files in parallel
+META_WORKERS = 8
 
 # === Logic ===
 global current_index_playing, index_to_play
@@ -98,159 +111,374 @@ def stop_caffeinate():
             pass
     caffeinate_proc = None
 
-def get_audio_duration(filepath):
-    """Try VLC first (works for most formats). Fall back to mutagen if VLC fails."""
-    try:
-        instance = vlc.Instance()
-        media = instance.media_new(filepath)
-        # blocking parse to ensure duration available
-        media.parse()
-        dur_ms = media.get_duration()
-        if dur_ms and dur_ms > 0:
-            return int(dur_ms / 1000)
-    except Exception:
-        pass
+# A single VLC instance shared by every duration probe and player (creating one is costly)
+_VLC_INSTANCE = vlc.Instance("--quiet", "--no-video")
 
-    # Fallback to mutagen (gives length in seconds if supported)
+def parse_media(media, timeout_ms):
+    """Run VLC's local parse of `media` and wait until it finishes or times out."""
+    # VLC signals MediaParsedChanged when the parse finishes or times out;
+    # wait on it instead of polling the status
+    parsed = threading.Event()
+    media.event_manager().event_attach(vlc.EventType.MediaParsedChanged,
+                                       lambda event: parsed.set())
+    media.parse_with_options(vlc.MediaParseFlag.local, timeout_ms)
+    parsed.wait(timeout_ms / 1000)
+
+def get_audio_duration(filepath):
+    """Try mutagen first (header read only). Fall back to VLC if mutagen fails."""
+    # Mutagen gives length in seconds if supported
     try:
         audio = MutagenFile(filepath)
         if audio and hasattr(audio, "info") and getattr(audio.info, "length", None):
             return int(audio.info.length)
+    except (MutagenError, OSError):
+        pass
+
+    # Fallback to VLC (works for most formats), with a bounded local-only parse
+    try:
+        media = _VLC_INSTANCE.media_new(filepath)
+        parse_media(media, 1000)
+        dur_ms = media.get_duration()
+        if dur_ms and dur_ms > 0:
+            return int(dur_ms / 1000)
     except Exception:
         pass
 
     return 0
 
-def renumber_tree():
-    """Update the 'No.' column to reflect the current order in the tree."""
-    for idx, item in enumerate(tree.get_children(), start=1):
-        values = list(tree.item(item, "values"))
-        values[0] = str(idx)
-        tree.item(item, values=values)
+# The tree's row ids in order, kept in step with every insert, delete and move, so
+# reading them never costs a tree.get_children() round-trip through Tcl
+row_ids = []
 
-# --- play marker helpers ---
-def clear_playing_mark():
-    """Remove playing marker (▶) and tags from all rows."""
-    for item in tree.get_children():
-        vals = list(tree.item(item, "values"))
-        if vals and len(vals) > 1 and isinstance(vals[1], str) and vals[1].startswith("▶ "):
-            vals[1] = vals[1][2:]
-            tree.item(item, values=vals)
-        # clear tags for safety
-        tree.item(item, tags=())
+# tree.index() walks the row list in Tk; map row id -> position instead, built
+# lazily from row_ids and dropped whenever rows are deleted or reordered
+row_index_cache = None
+
+def row_index(item):
+    """Return the position of row `item` in the tree, or -1 if it is not a row."""
+    global row_index_cache
+    if row_index_cache is None:
+        row_index_cache = {iid: i for i, iid in enumerate(row_ids)}
+    return row_index_cache.get(item, -1)
+
+def forget_row_index():
+    """Drop the row id -> position map; call after rows are deleted or reordered."""
+    global row_index_cache
+    row_index_cache = None
+
+def renumber_tree(start=0):
+    """Update the 'No.' column from row `start` on; rows above it keep their number."""
+    for idx in range(start, len(row_ids)):
+        # write just the 'No.' cell instead of reading and rewriting all values
+        tree.set(row_ids[idx], "No.", str(idx + 1))
 
 # --- play marker helpers ---
-def clear_stop_mark():
-    """Remove playing marker (▶) and tags from all rows."""
-    for item in tree.get_children():
-        vals = list(tree.item(item, "values"))
-        if vals and len(vals) > 1 and isinstance(vals[1], str) and vals[1].startswith("■ "):
-            vals[1] = vals[1][2:]
-            tree.item(item, values=vals)
-        # clear tags for safety
-        tree.item(item, tags=())
-
-def mark_pause_item(index):
-    """Mark the row at `index` as pause (add ⏸ prefix + 'playing' tag) and clear others."""
-    children = tree.get_children()
-    if not children:
+# The marker symbol has its own narrow "St" column, so the Title cell is never
+# touched. At most one row carries a marker; remember it so a change writes two cells
+MARK_PLAYING = "▶"
+MARK_PAUSED = "⏸"
+MARK_STOPPED = "■"  # keeps the 'playing' tag/colors on the last played row
+marked_item = None
+marked_symbol = ""
+
+def unmark_item():
+    """Remove the marker symbol and 'playing' tag from the currently marked row."""
+    global marked_item, marked_symbol
+    if marked_item is not None and tree.exists(marked_item):
+        tree.item(marked_item, tags=())
+        tree.set(marked_item, "St", "")
+    marked_item = None
+    marked_symbol = ""
+
+def set_mark(index, symbol):
+    """Mark the row at `index` with `symbol` + 'playing' tag and unmark the previous row."""
+    global marked_item, marked_symbol
+    if not 0 <= index < len(row_ids):
+        unmark_item()
         return
-    for i, item in enumerate(children):
-        vals = list(tree.item(item, "values"))
-        # ensure there's a title column
-        if not vals or len(vals) < 2:
-            continue
-        if i == index:
-            # remove stop marker if present
-            if vals[1].startswith("▶ ") or vals[1].startswith("⏸ ") or vals[1].startswith("■ "):
-                vals[1] = vals[1][2:]
-            if not vals[1].startswith("⏸ "):
-                vals[1] = "⏸ " + vals[1]
-                tree.item(item, values=vals)
-            tree.item(item, tags=("playing",))
-        else:
-            if vals[1].startswith("▶ ") or vals[1].startswith("⏸ ") or vals[1].startswith("■ "):
-                vals[1] = vals[1][2:]
-                tree.item(item, values=vals)
-            tree.item(item, tags=())
-
-def mark_playing_item(index):
-    """Mark the row at `index` as pause (add ⏸ prefix + 'playing' tag) and clear others."""
-    children = tree.get_children()
-    if not children:
-        return
-    for i, item in enumerate(children):
-        vals = list(tree.item(item, "values"))
-        # ensure there's a title column
-        if not vals or len(vals) < 2:
-            continue
-        if i == index:
-            # remove stop marker if present
-            if vals[1].startswith("▶ ") or vals[1].startswith("⏸ ") or vals[1].startswith("■ "):
-                vals[1] = vals[1][2:]
-            if not vals[1].startswith("▶ "):
-                vals[1] = "▶ " + vals[1]
-                tree.item(item, values=vals)
-            tree.item(item, tags=("playing",))
-        else:
-            if vals[1].startswith("▶ ") or vals[1].startswith("⏸ ") or vals[1].startswith("■ "):
-                vals[1] = vals[1][2:]
-                tree.item(item, values=vals)
-            tree.item(item, tags=())
-
-def add_song_to_list(path):
-    """Add a file to playlist and populate sensible title/artist for many formats."""
-    if not os.path.isfile(path):
+    item = row_ids[index]
+    if item == marked_item and symbol == marked_symbol:
         return
-
-    ext = os.path.splitext(path)[1].lower()
-    basename = os.path.basename(path)
+    if item != marked_item:
+        unmark_item()
+        tree.item(item, tags=("playing",))
+    tree.set(item, "St", symbol)
+    marked_item, marked_symbol = item, symbol
+
+def clear_mark(symbol):
+    """Remove the marker and its tag if the marked row shows `symbol`."""
+    if marked_symbol == symbol:
+        unmark_item()
+
+# Tag keys tried in order: easy mode gives MP3/MP4/FLAC/Ogg the normalized key, the
+# raw keys only matter for formats without an easy mode (ID3 in WAV, ASF/WMA)
+TITLE_KEYS = ("title", "Title", "TIT2", "\xa9nam")
+ARTIST_KEYS = ("artist", "Author", "TPE1", "\xa9ART")
+
+def first_tag(tags, keys):
+    """Return the first value found in `tags` under one of `keys`, as a string, or None."""
+    for k in keys:
+        if k in tags:
+            v = tags[k]
+            try:
+                return str(v[0]) if isinstance(v, (list, tuple)) else str(v)
+            except Exception:
+                return str(v)
+    return None
+
+def read_song_meta(path, basename=None):
+    """Return (title, artist, duration) of `path` from a single mutagen parse; touches
+    no Tk state, so safe on a worker thread.
+
+    duration is None when mutagen cannot tell; duration_worker then asks VLC later,
+    so adding rows never waits on it. Callers that already know the file name (a
+    directory scan) pass it as `basename`.
+    """
+    if basename is None:
+        basename = os.path.basename(path)
+    ext = os.path.splitext(basename)[1].lower()
     title = basename
     artist = "Unknown"
+    dur = None
 
-    # MP3: prefer EasyID3
-    if ext == ".mp3":
-        try:
-            tags = EasyID3(path)
-            title = tags.get("title", [basename])[0]
-            artist = tags.get("artist", ["Unknown"])[0]
-        except Exception:
-            pass
-    else:
-        # Other formats: use mutagen generic File and try common tag keys
-        try:
-            audio = MutagenFile(path)
-            if audio and audio.tags:
-                # try common keys (many formats provide lists)
-                def first_tag(tags, *keys):
-                    for k in keys:
-                        if k in tags:
-                            v = tags[k]
-                            try:
-                                return v[0] if isinstance(v, (list, tuple)) else str(v)
-                            except Exception:
-                                return str(v)
-                    return None
-
-                t = first_tag(audio.tags, "title", "TITLE", "TIT2", "\xa9nam")
-                a = first_tag(audio.tags, "artist", "ARTIST", "TPE1", "\xa9ART")
-                if t:
-                    title = t
-                if a:
-                    artist = a
-        except Exception:
-            pass
+    # One MutagenFile(easy=True) handle gives tags and duration for every format
+    try:
+        audio = MutagenFile(path, easy=True)
+        if audio and audio.tags:
+            title = first_tag(audio.tags, TITLE_KEYS) or title
+            artist = first_tag(audio.tags, ARTIST_KEYS) or artist
+        if audio and getattr(getattr(audio, "info", None), "length", None):
+            dur = int(audio.info.length)
+    except (MutagenError, OSError):
+        pass
+    except Exception as e:
+        # mutagen raises other errors on some truncated files; one bad file must not
+        # abort the whole scan, so show it by name with an unknown duration
+        print(f"Error reading tags of {path}: {e}")
+        title, artist, dur = basename, "Unknown", None
 
     # Append extension label for non-mp3 files (optional UI hint)
     if ext != ".mp3" and ext:
         title = f"{title} [{ext[1:].upper()}]"
 
-    dur = get_audio_duration(path)
-
+    return title, artist, dur
+
+@functools.lru_cache(maxsize=None)
+def format_duration(seconds):
+    """Return `seconds` as 'MM:SS'; memoized, since tracks share a small set of lengths."""
+    return f"{seconds//60:02}:{seconds%60:02}"
+
+# --- background durations ---
+# Rows whose length the tag read could not give are added with a placeholder; one
+# worker thread probes those files (VLC parse) in the order they were added. The same
+# thread parses the Media play_song prefetches, so VLC parses never run concurrently.
+# It never touches Tk: results go to duration_results, which drain_durations empties
+# on the Tk thread every DURATION_DRAIN_MS while probes are outstanding.
+NO_DURATION = "--:--"
+DURATION_DRAIN_MS = 100
+duration_queue = queue.Queue()    # (row, path) to probe or (None, path) to prefetch; filled on Tk
+duration_results = queue.Queue()  # (row, path, seconds or None), filled by the worker
+durations_pending = 0             # queued probes whose result has not been shown yet
+song_durations = {}  # path -> seconds, known at add time or from the worker; read by play_song
+
+def duration_worker():
+    """Probe the duration of each queued (row, path) and queue the result for Tk."""
+    while True:
+        iid, path = duration_queue.get()
+        if iid is None:
+            parse_prefetch(path)  # no row to update: this is the next song's Media
+            continue
+        try:
+            dur = get_audio_duration(path)
+        except Exception as e:
+            # one bad file must not end the worker: its row just keeps the placeholder
+            print(f"Error reading duration of {path}: {e}")
+            dur = None
+        duration_results.put((iid, path, dur))
+
+def queue_duration(iid, path):
+    """Hand row `iid` to the duration worker and make sure the results get drained (Tk thread)."""
+    global durations_pending
+    duration_queue.put((iid, path))
+    durations_pending += 1
+    if durations_pending == 1:
+        root.after(DURATION_DRAIN_MS, drain_durations)
+
+def drain_durations():
+    """Show the durations the worker has read; reschedule while probes are outstanding."""
+    global durations_pending, current_song_length, total_time_text
+    while True:
+        try:
+            iid, path, dur = duration_results.get_nowait()
+        except queue.Empty:
+            break
+        durations_pending -= 1
+        if dur is not None:
+            song_durations[path] = dur
+            show_row_duration(iid, dur)
+            if player is not None and row_index(iid) == current_index_playing:
+                # play_song started this song before its length was known
+                current_song_length = dur
+                total_time_text = f" / {format_duration(dur)}"
+                progress_bar["maximum"] = dur
+    if durations_pending:
+        root.after(DURATION_DRAIN_MS, drain_durations)
+
+def show_row_duration(iid, dur):
+    """Write `dur` seconds into the Duration cell of row `iid`, if it still exists (Tk thread)."""
+    if tree.exists(iid):
+        tree.set(iid, "Duration", format_duration(dur))
+
+threading.Thread(target=duration_worker, daemon=True).start()
+
+def append_song_row(path, meta):
+    """Append `path` to the playlist and its row, built from `meta`, to the tree (Tk thread)."""
+    title, artist, dur = meta
     playlist.append(path)
-    number_of_songs = len(tree.get_children())
-    tree.insert("", "end", values=(str(number_of_songs + 1), title, artist, f"{dur//60:02}:{dur%60:02}"))
-    renumber_tree()
+    if dur is None:
+        shown = NO_DURATION
+    else:
+        shown = format_duration(dur)
+        song_durations[path] = dur
+    # rows are only appended here, so the new row's number is the playlist length
+    iid = tree.insert("", "end", values=("", str(len(playlist)), title, artist, shown))
+    row_ids.append(iid)
+    if row_index_cache is not None:
+        row_index_cache[iid] = len(row_ids) - 1  # an append moves no other row
+    if dur is None:
+        queue_duration(iid, path)
+
+# --- playlist persistence ---
+# Writes are debounced: a burst of edits (e.g. repeated moves) is saved once
+SAVE_DELAY_MS = 500
+save_after_id = None
+
+def schedule_save():
+    """Save the playlist to PLAYLIST_FILE shortly, coalescing saves requested meanwhile."""
+    global save_after_id
+    if save_after_id is not None:
+        root.after_cancel(save_after_id)
+    save_after_id = root.after(SAVE_DELAY_MS, flush_playlist)
+
+def flush_playlist():
+    """Write the playlist to PLAYLIST_FILE now in one write, atomically (temp file + rename)."""
+    global save_after_id
+    if save_after_id is not None:
+        root.after_cancel(save_after_id)
+        save_after_id = None
+    tmp_file = PLAYLIST_FILE + ".tmp"
+    try:
+        with open(tmp_file, "w") as f:
+            f.write(json.dumps({"playlist": playlist}))
+        os.replace(tmp_file, PLAYLIST_FILE)
+    except OSError as e:
+        print(f"Error saving playlist: {e}")
+
+def iter_audio_files(folder):
+    """Yield (path, name) of supported audio files under `folder`, sorted: its files
+    first, then sub-folders.
+
+    os.scandir's entries carry the file type from the directory read, so no extra
+    stat is needed per entry (os.walk + os.path.isfile did two).
+    """
+    stack = [folder]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        subfolders = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subfolders.append(entry.path)
+            elif entry.is_file() and is_supported(entry.name):
+                yield entry.path, entry.name
+        # pushed in reverse so sub-folders are visited in name order
+        stack.extend(reversed(subfolders))
+
+# Folder scans and playlist loads run on worker threads and hand their rows to Tk
+# through scan_queue; the main thread drains it every SCAN_DRAIN_MS, appending at most
+# SCAN_BATCH rows a tick
+SCAN_DRAIN_MS = 50
+SCAN_BATCH = 200
+scan_queue = queue.Queue()
+scans_running = 0
+scan_added = False  # some scan since the last drain finish appended rows
+
+def queue_rows(paths, names=None):
+    """Read the tags of `paths` in parallel and queue their rows in order (worker thread)."""
+    if names is None:
+        names = [None] * len(paths)
+    # map keeps the input order, so rows arrive in the order given
+    with ThreadPoolExecutor(max_workers=META_WORKERS) as ex:
+        for path, meta in zip(paths, ex.map(read_song_meta, paths, names)):
+            scan_queue.put((path, meta))
+
+def scan_folder(folder):
+    """Worker: read the tags of every audio file under `folder` in parallel and queue them in order."""
+    try:
+        files = list(iter_audio_files(folder))
+        queue_rows([path for path, name in files], [name for path, name in files])
+    finally:
+        scan_queue.put(None)  # end of this scan, so the drain loop can stop
+
+def read_files(paths):
+    """Worker: queue the rows of those `paths` that are files, in the order given."""
+    try:
+        queue_rows([path for path in paths if os.path.isfile(path)])
+    finally:
+        scan_queue.put(None)  # end of this "scan", so the drain loop can stop
+
+def read_saved_playlist():
+    """Worker: read the paths saved in PLAYLIST_FILE and queue their rows for Tk."""
+    try:
+        try:
+            with open(PLAYLIST_FILE) as f:
+                paths = json.load(f).get("playlist", [])
+        except (OSError, ValueError):  # unreadable or not JSON (JSONDecodeError is a ValueError)
+            paths = []
+        queue_rows([path for path in paths if os.path.exists(path)])
+    finally:
+        scan_queue.put(None)  # end of this "scan", so the drain loop can stop
+
+def start_scan(target, *args):
+    """Run the worker `target` on its own thread and drain its rows as they arrive (Tk thread)."""
+    global scans_running
+    threading.Thread(target=target, args=args, daemon=True).start()
+    scans_running += 1
+    if scans_running == 1:
+        root.after(SCAN_DRAIN_MS, drain_scan_queue)
+
+def drain_scan_queue():
+    """Append the next batch of scanned rows; reschedule until every scan has finished."""
+    global scans_running, scan_added
+    for _ in range(SCAN_BATCH):
+        try:
+            item = scan_queue.get_nowait()
+        except queue.Empty:
+            break
+        if item is None:
+            scans_running -= 1
+        else:
+            append_song_row(*item)
+            scan_added = True
+    if scans_running:
+        root.after(SCAN_DRAIN_MS, drain_scan_queue)
+        return
+    if not scan_added:
+        return  # nothing new: keep the saved playlist and the selection as they are
+    scan_added = False
+
+    # persist playlist
+    schedule_save()
+
+    # Select the first song if available
+    if row_ids:
+        first_item = row_ids[0]
+        tree.selection_set(first_item)
+        tree.focus(first_item)
+        tree.see(first_item)
 
 def add_folder():
     global last_opened_folder
@@ -261,31 +489,14 @@ def add_folder():
     #playlist.clear()
     #tree.delete(*tree.get_children())
 
-    # Walk folder recursively and add supported files in a stable order
-    for root_dir, dirs, files in os.walk(folder):
-        dirs.sort()
-        for file in sorted(files):
-            if file.lower().endswith(SUPPORTED_EXTS):
-                path = os.path.join(root_dir, file)
-                add_song_to_list(path)
-
     # remember last opened folder
     last_opened_folder = folder
 
-    # update numbers and persist playlist
-    renumber_tree()
-    with open(PLAYLIST_FILE, "w") as f:
-        json.dump({"playlist": playlist}, f)
-
     if player:
         stop_song()
 
-    # Select the first song if available
-    if tree.get_children():
-        first_item = tree.get_children()[0]
-        tree.selection_set(first_item)
-        tree.focus(first_item)
-        tree.see(first_item)
+    # Walk folder recursively off the Tk thread; rows arrive as they are read
+    start_scan(scan_folder, folder)
 
 def add_songs():
     global last_opened_folder
@@ -299,80 +510,99 @@ def add_songs():
         return
     # Remember the folder of the first selected file
     last_opened_folder = os.path.dirname(song_tmp[0])
-    for file in sorted(song_tmp):
-        if file.lower().endswith(SUPPORTED_EXTS):
-            add_song_to_list(file)
-    renumber_tree()
-    json.dump({"playlist": playlist}, open(PLAYLIST_FILE, "w"))
+    # tags are read off the Tk thread like a folder's; drain_scan_queue saves the playlist
+    start_scan(read_files, [file for file in sorted(song_tmp) if is_supported(file)])
 
 def clear_songs_list():
     if player:
         stop_song()
-    playlist.clear(); tree.delete(*tree.get_children())
-    json.dump({"playlist": playlist}, open(PLAYLIST_FILE, "w"))
+    playlist.clear(); tree.delete(*row_ids); row_ids.clear(); forget_row_index()
+    schedule_save()
 
 def load_saved_playlist():
+    """Read the saved playlist on a worker thread so the window shows up right away;
+    its rows arrive through scan_queue like a folder scan's."""
     if not os.path.exists(PLAYLIST_FILE):
         return
-    try:
-        data = json.load(open(PLAYLIST_FILE))
-        for path in data.get("playlist", []):
-            if os.path.exists(path):
-                add_song_to_list(path)
-    except Exception:
-        pass
-
-    json.dump({"playlist": playlist}, open(PLAYLIST_FILE, "w"))
-
-    # 👇 Select the first song if available
-    if tree.get_children():
-        first_item = tree.get_children()[0]
-        tree.selection_set(first_item)
-        tree.focus(first_item)
-        tree.see(first_item)
+    start_scan(read_saved_playlist)
 
-def play_selected():
+def play_selected(event=None):
     global current_index, index_to_play, current_index_playing
     sel = tree.selection()
     if sel:
-        current_index = tree.index(sel[0])
+        current_index = row_index(sel[0])
         
     if paused and current_index_playing == current_index:
         pause_song()
-        wait_for_playing_and_update()
         return
     
     if sel:
         index_to_play = current_index
         play_song()
         
+# The next song's Media is created and parsed by the duration worker while the current
+# one plays, so a skip or the move to the next song starts from a warm Media
+prefetched_media = None  # (path, vlc.Media) of the song after the playing one
+
+def prefetch_media(path):
+    """Ask the duration worker to prepare the Media for `path` (Tk thread)."""
+    duration_queue.put((None, path))
+
+def parse_prefetch(path):
+    """Worker: create and parse the Media for `path`, replacing any earlier one."""
+    global prefetched_media
+    try:
+        media = _VLC_INSTANCE.media_new(path)
+        parse_media(media, 2000)
+    except Exception as e:
+        print(f"Error prefetching {path}: {e}")
+        return
+    prefetched_media = (path, media)
+
+def take_media(path):
+    """Return the prefetched Media if it is for `path`, otherwise a new one."""
+    global prefetched_media
+    prefetched = prefetched_media  # read once: the worker may replace it meanwhile
+    if prefetched is not None and prefetched[0] == path:
+        prefetched_media = None
+        return prefetched[1]
+    return _VLC_INSTANCE.media_new(path)
+
 def play_song():
-    global player, current_song_length, current_index_playing, index_to_play
+    global player, current_song_length, total_time_text, current_index_playing, index_to_play
     if player and player.get_state() == vlc.State.Playing and current_index_playing == index_to_play:
         return
     stop_song()
-    clear_stop_mark()
     if index_to_play < 0:
         index_to_play = current_index
     current_index_playing = index_to_play
     song = playlist[current_index_playing]
-    player = vlc.MediaPlayer(song)
+    player = _VLC_INSTANCE.media_player_new()
+    player.set_media(take_media(song))
+    # VLC reports the end on its own thread, where Tk must not be called: only queue
+    # this player for the playback tick
+    player.event_manager().event_attach(vlc.EventType.MediaPlayerEndReached,
+                                        lambda event, p=player: ended_players.put(p))
     player.audio_set_volume(int(volume_slider.get()))
     player.play()
-    audio = MP3(song)
 
     # start preventing mac sleep while playing
     start_caffeinate()
 
-    current_song_length = get_audio_duration(song)
+    # known from the tag read or the worker; if the worker has not got to this song yet,
+    # start at 0 and let drain_durations fill it in, rather than probing on the Tk thread
+    current_song_length = song_durations.get(song, 0)
+    # the total part of the time label is constant per song: format it once
+    total_time_text = f" / {format_duration(current_song_length)}"
     progress_bar["maximum"] = current_song_length
     #print("progress_bar maximum set to ", current_song_length)
 
     label_var.set(f"🎵 Now playing: {os.path.basename(song)}")
-    wait_for_playing_and_update()
-    check_song_end()
+    start_playback_tick()
     #tree.selection_set(tree.get_children()[current_index])
-    mark_playing_item(current_index_playing)
+    set_mark(current_index_playing, MARK_PLAYING)
+    if len(playlist) > 1:
+        prefetch_media(playlist[(current_index_playing + 1) % len(playlist)])
 
 def pause_song():
     global paused
@@ -383,53 +613,30 @@ def pause_song():
         if paused:
             # allow system to sleep when paused
             stop_caffeinate()
-            mark_pause_item(current_index_playing)
+            set_mark(current_index_playing, MARK_PAUSED)
         else:
             # resume preventing sleep
             start_caffeinate()
-            mark_playing_item(current_index_playing)
-            wait_for_playing_and_update()
-
-def mark_stopped_item(index):
-    """Mark the row at `index` as stopped (■ prefix) but keep the same tag/colors."""
-    children = tree.get_children()
-    if not children:
-        return
-    for i, item in enumerate(children):
-        vals = list(tree.item(item, "values"))
-        if not vals or len(vals) < 2:
-            continue
-        if i == index:
-            # remove playing marker if present
-            if vals[1].startswith("▶ ") or vals[1].startswith("⏸ ") or vals[1].startswith("■ "):
-                vals[1] = vals[1][2:]
-            # add stopped marker if not present
-            if not vals[1].startswith("■ "):
-                vals[1] = "■ " + vals[1]
-                tree.item(item, values=vals)
-            # keep the same visual tag so colors remain
-            tree.item(item, tags=("playing",))
-        else:
-            # remove stopped marker from other rows
-            if vals[1].startswith("▶ ") or vals[1].startswith("⏸ ") or vals[1].startswith("■ "):
-                vals[1] = vals[1][2:]
-                tree.item(item, values=vals)
-            tree.item(item, tags=())
+            set_mark(current_index_playing, MARK_PLAYING)
+            start_playback_tick()
 
 def stop_song():
-    global paused
+    global paused, last_shown_second
     paused = False
     if player:
         player.stop()
+    last_shown_second = None
     # stop preventing mac sleep when playback stops
     stop_caffeinate()
     progress_bar['value'] = 0
     label_var.set("⏹ Stopped")
     time_label.config(text="")
-    # keep the same background/foreground for the last played item
-    clear_playing_mark()
+    # keep the same background/foreground for the last played item; set_mark moves
+    # the single marker, so no separate clear is needed first
     if 0 <= current_index_playing < len(playlist):
-        mark_stopped_item(current_index_playing)
+        set_mark(current_index_playing, MARK_STOPPED)
+    else:
+        clear_mark(MARK_PLAYING)
         
 
 def skip(step):
@@ -437,27 +644,86 @@ def skip(step):
     index_to_play = (index_to_play + step) % len(playlist)
     play_song()
 
+# --- playback tick ---
+# One timer follows the player and refreshes the progress while it plays. It stops
+# itself when nothing is playing (paused, stopped, no player) and is restarted by
+# play/resume. The end of a song comes from VLC's EndReached event: its callback runs
+# on VLC's thread, so it only queues the player in ended_players and the tick
+# handles it here on the Tk thread (a Tk call from VLC's thread can deadlock
+# against player.stop()). An ended player keeps the tick alive until then.
+PLAYBACK_TICK_MS = 250
+tick_after_id = None
+last_shown_second = None
+ended_players = queue.Queue()
+
+def start_playback_tick():
+    """Arm the playback tick unless it is already running."""
+    global tick_after_id
+    if tick_after_id is None:
+        tick_after_id = root.after(PLAYBACK_TICK_MS, playback_tick)
+
+def playback_tick():
+    global tick_after_id
+    tick_after_id = None
+    while True:
+        try:
+            ended_player = ended_players.get_nowait()
+        except queue.Empty:
+            break
+        on_song_end(ended_player)
+    if tick_after_id is not None:
+        return  # an end started the next song, and play_song re-armed the tick
+    p = player  # one global lookup per tick
+    if p is None:
+        return
+    state = p.get_state()
+    if state == vlc.State.Playing:
+        update_progress()
+    if paused or state in (vlc.State.Stopped, vlc.State.Error):
+        return
+    tick_after_id = root.after(PLAYBACK_TICK_MS, playback_tick)
+
 def update_progress():
-    if player is not None and player.get_state() == vlc.State.Playing:
-        pos = int(player.get_time() / 1000)
-        progress_bar['value'] = pos
-        #print("progress_bar value set to ", pos)
-
-        minutes = pos // 60
-        seconds = pos % 60
-        total = current_song_length
-        total_minutes = total // 60
-        total_seconds = total % 60
-
-        time_label.config(text=f"{minutes:02}:{seconds:02} / {total_minutes:02}:{total_seconds:02}")
-
-        if pos < total:
-            root.after(1000, update_progress)
-    elif player and player.get_state() == vlc.State.Ended:
-        progress_bar['value'] = 0
-        time_label.config(text="")
-        if not paused and current_index_playing < len(playlist) - 1:
+    """Show the playing position; Tk is only touched when the shown second changes."""
+    global last_shown_second
+    p = player
+    if p is None:
+        return
+    pos = int(p.get_time() / 1000)
+    if pos == last_shown_second:
+        return
+    if root.state() == "iconic":
+        # minimized: nothing to redraw; last_shown_second stays stale, so the
+        # first tick after the window is restored paints the current position
+        return
+    last_shown_second = pos
+    progress_bar['value'] = pos
+    #print("progress_bar value set to ", pos)
+
+    time_label.config(text=format_duration(pos) + total_time_text)
+
+def on_song_end(ended_player):
+    """Queued EndReached (Tk thread): move on, unless `ended_player` has been replaced since."""
+    if ended_player is player:
+        song_ended()
+
+def song_ended():
+    """Play the next song, or start over from the first one after the last."""
+    global index_to_play, last_shown_second
+    progress_bar['value'] = 0
+    time_label.config(text="")
+    last_shown_second = None
+    if not paused:
+        if current_index_playing < len(playlist) - 1:
             skip(1)
+        elif len(playlist) > 0:
+            index_to_play = 0
+            play_song()
+            # --- Ensure the first song is selected in the tree ---
+            first_item = row_ids[0]
+            #tree.selection_set(first_item)
+            #tree.focus(first_item)
+            tree.see(first_item)
 
 def seek_progress(e):
     if player:
@@ -471,40 +737,13 @@ def seek_progress(e):
         player.set_time(set_time)
         update_progress()
 
-def wait_for_playing_and_update():
-    if player is not None and player.get_state() == vlc.State.Playing:
-        update_progress()
-    else:
-        root.after(200, wait_for_playing_and_update)  # Retry in 200 ms
-
-def check_song_end():
-    global player, current_index_playing
-    if player is not None:
-        state = player.get_state()
-        if state == vlc.State.Ended:
-            progress_bar['value'] = 0
-            time_label.config(text="")
-            if not paused:
-                if current_index_playing < len(playlist) - 1:
-                    skip(1)
-                elif len(playlist) > 0:
-                    current_index_playing = 0
-                    play_song()
-                    # --- Ensure the first song is selected in the tree ---
-                    first_item = tree.get_children()[0]
-                    #tree.selection_set(first_item)
-                    #tree.focus(first_item)
-                    tree.see(first_item)
-            return
-    root.after(1000, check_song_end)
-
 def delete_current_song():
     global player, current_index, current_index_playing
 
     sel = tree.selection()
     if not sel:
         return
-    idx = tree.index(sel[0])
+    idx = row_index(sel[0])
     if idx < 0 or idx >= len(playlist):
         return
 
@@ -516,7 +755,10 @@ def delete_current_song():
 
     del playlist[idx]
     tree.delete(sel[0])
-    renumber_tree()
+    del row_ids[idx]
+    forget_row_index()
+    # only the rows after the deleted one moved up
+    renumber_tree(idx)
 
     # adjust playing index if it was after deleted index
     if player is not None and current_index_playing > idx:
@@ -528,7 +770,7 @@ def delete_current_song():
         current_index = new_index
         if was_playing_deleted:
             current_index_playing = current_index
-        item = tree.get_children()[current_index]
+        item = row_ids[current_index]
         tree.selection_set(item)
         tree.focus(item)
         tree.see(item)
@@ -536,7 +778,7 @@ def delete_current_song():
         current_index = 0
         current_index_playing = 0
 
-    json.dump({"playlist": playlist}, open(PLAYLIST_FILE, "w"))
+    schedule_save()
 
 def save_playlist_as():
     file_path = filedialog.asksaveasfilename(
@@ -546,7 +788,7 @@ def save_playlist_as():
     )
     if file_path:
         with open(file_path, "w") as f:
-            json.dump({"playlist": playlist}, f)
+            f.write(json.dumps({"playlist": playlist}))  # one write, not one per token
 
 def load_playlist_from_file():
     file_path = filedialog.askopenfilename(
@@ -557,20 +799,16 @@ def load_playlist_from_file():
     if file_path:
         try:
             with open(file_path, "r") as f:
-                data = json.load(f)
-                playlist.clear()
-                tree.delete(*tree.get_children())
-                for path in data.get("playlist", []):
-                    add_song_to_list(path)
+                paths = json.load(f).get("playlist", [])
         except Exception as e:
             ttk.messagebox.showerror("Error", f"Failed to load playlist:\n{e}")
-
-        # Select the first song if available
-        if tree.get_children():
-            first_item = tree.get_children()[0]
-            tree.selection_set(first_item)
-            tree.focus(first_item)
-            tree.see(first_item)
+            return
+        playlist.clear()
+        tree.delete(*row_ids)
+        row_ids.clear()
+        forget_row_index()
+        # the tags are read off the Tk thread; drain_scan_queue selects the first song
+        start_scan(read_files, paths)
 
 def move_song(old_index, new_index):
     """Move song in playlist and reorder the Treeview. Keep selection/play indexes in sync."""
@@ -585,16 +823,15 @@ def move_song(old_index, new_index):
     item = playlist.pop(old_index)
     playlist.insert(new_index, item)
 
-    # capture current tree values and reorder
-    values = [list(tree.item(c, "values")) for c in tree.get_children()]
-    moved_vals = values.pop(old_index)
-    values.insert(new_index, moved_vals)
+    # move the row in place: its item id, values and marker travel with it
+    item_id = row_ids.pop(old_index)
+    row_ids.insert(new_index, item_id)
+    forget_row_index()
+    tree.move(item_id, "", new_index)
 
-    # rebuild tree from reordered values
-    tree.delete(*tree.get_children())
-    for i, vals in enumerate(values, start=1):
-        vals[0] = str(i)
-        tree.insert("", "end", values=vals)
+    # only the rows between the old and new position change number
+    for i in range(min(old_index, new_index), max(old_index, new_index) + 1):
+        tree.set(row_ids[i], "No.", str(i + 1))
 
     # adjust selection index
     if current_index == old_index:
@@ -612,67 +849,87 @@ def move_song(old_index, new_index):
     elif new_index <= current_index_playing < old_index:
         current_index_playing += 1
 
-    renumber_tree()
-
-    # restore selection and focus
-    if tree.get_children():
-        #sel_index = max(0, min(current_index, len(tree.get_children()) - 1))
-        item_id = tree.get_children()[new_index]
-        tree.selection_set(item_id)
-        tree.focus(item_id)
-        tree.see(item_id)
-
-    # update visual markers
-    if player is not None:
-        # there's an active player; mark playing item
-        if 0 <= current_index_playing < len(playlist):
-            mark_playing_item(current_index_playing)
-        else:
-            clear_playing_mark()
-    else:
-        # no active player: keep stopped marker if applicable
-        clear_stop_mark()
-        if 0 <= current_index_playing < len(playlist):
-            mark_stopped_item(current_index_playing)
+    # keep the moved row selected and visible
+    tree.selection_set(item_id)
+    tree.focus(item_id)
+    tree.see(item_id)
 
     # persist playlist
-    with open(PLAYLIST_FILE, "w") as f:
-        json.dump({"playlist": playlist}, f)
+    schedule_save()
 
 
-def move_selected_up():
+def move_selected_up(event=None):
     print("move_selected_up called")
     sel = tree.selection()
     if not sel:
         return
-    idx = tree.index(sel[0])
-    if idx <= 0:
+    idx = row_index(sel[0])
+    if idx <= 0:  # -1: the row is gone
         return
     move_song(idx, idx - 1)
 
 
-def move_selected_down():
+def move_selected_down(event=None):
     print("move_selected_down called")
     sel = tree.selection()
     if not sel:
         return
-    idx = tree.index(sel[0])
-    if idx >= len(playlist) - 1:
+    idx = row_index(sel[0])
+    if idx < 0 or idx >= len(playlist) - 1:
         return
     move_song(idx, idx + 1)
 
+# held Ctrl-key moves arrive at the key-repeat rate; sum them and move once per idle
+pending_move = 0
+
+def schedule_move(delta):
+    global pending_move
+    if pending_move == 0:
+        root.after_idle(apply_pending_move)
+    pending_move += delta
+
+def apply_pending_move():
+    global pending_move
+    delta, pending_move = pending_move, 0
+    sel = tree.selection()
+    if not sel or delta == 0:
+        return
+    idx = row_index(sel[0])
+    if idx < 0:  # the selected row was deleted before this idle callback ran
+        return
+    move_song(idx, max(0, min(len(playlist) - 1, idx + delta)))
+
+def move_up_key(event):
+    schedule_move(-1)
+
+def move_down_key(event):
+    schedule_move(1)
+
 # === Context Menu ===
+context_menu = None  # built on first use
+
 def show_context_menu(event):
+    global context_menu
     # Select the row under mouse
     row_id = tree.identify_row(event.y)
     if row_id:
         tree.selection_set(row_id)
-        context_menu.tk_popup(event.x_root, event.y_root)
+        if context_menu is None:
+            context_menu = tk.Menu(root, tearoff=0)
+            context_menu.add_command(label="Delete from list", command=delete_current_song)
+            context_menu.add_command(label="Move up", command=move_selected_up)
+            context_menu.add_command(label="Move down", command=move_selected_down)
+        try:
+            context_menu.tk_popup(event.x_root, event.y_root)
+        finally:
+            # don't let the menu keep the input grab after it is dismissed
+            context_menu.grab_release()
 
 
 
 PLAYLIST_FILE = "last_playlist.json"
 playlist, current_index, paused, player, current_song_length = [], 0, False, None, 0
+total_time_text = ""  # " / MM:SS" of the current song, appended to the elapsed time
 last_opened_folder = os.path.expanduser("~")  # Default to home folder
 
 # === Setup GUI ===
@@ -694,10 +951,11 @@ root.minsize(750, 500)
 tree_frame = ttk.Frame(root)
 tree_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=(10, 5))
 
-columns = ("No.", "Title", "Artist", "Duration")
+columns = ("St", "No.", "Title", "Artist", "Duration")
 tree = ttk.Treeview(tree_frame, columns=columns, show="headings", selectmode="browse")
 for col in columns:
     tree.heading(col, text=col)
+tree.column("St", width=24, anchor='center', stretch=False)
 tree.column("No.", width=40)
 tree.column("Title", width=300)
 tree.column("Artist", width=180)
@@ -709,7 +967,7 @@ tree.tag_configure("playing", background="#6A6153", foreground="#8dff96")
 
 scroll = ttk.Scrollbar(tree_frame, orient="vertical", command=tree.yview)
 tree.configure(yscrollcommand=scroll.set)
-tree.bind("<Double-1>", lambda e: play_selected())
+tree.bind("<Double-1>", play_selected)
 tree.grid(row=0, column=0, sticky="nsew")
 scroll.grid(row=0, column=1, sticky='ns')
 tree_frame.grid_rowconfigure(0, weight=1)
@@ -722,7 +980,7 @@ ttk.Label(root, textvariable=label_var).pack(pady=(5, 5))
 # === Progress + Time ===
 progress_bar = ttk.Progressbar(root, orient="horizontal", length=600, mode="determinate")
 progress_bar.pack(pady=4)
-progress_bar.bind("<Button-1>", lambda e: seek_progress(e))
+progress_bar.bind("<Button-1>", seek_progress)
 
 time_label = ttk.Label(root, text="")
 time_label.pack()
@@ -768,52 +1026,92 @@ ttk.Label(vol_frame, textvariable=volume_percent).pack(side=tk.LEFT, padx=6)
 btn2_frame = ttk.Frame(root)
 btn2_frame.pack(pady=12)
 
-# make all six control buttons the same visual width
+# make all control buttons the same visual width
 BTN2_WIDTH = 12
+ttk.Style(root).configure("Ctl.TButton", width=BTN2_WIDTH)
+
+BUTTONS = [
+    ("Add folder", add_folder, 0, 0),
+    ("Add songs", add_songs, 0, 1),
+    ("Delete", delete_current_song, 0, 2),
+    ("Clear", clear_songs_list, 0, 3),
+    ("Save playlist as...", save_playlist_as, 1, 0),
+    ("Load playlist...", load_playlist_from_file, 1, 1),
+    ("Move up", move_selected_up, 1, 2),
+    ("Move down", move_selected_down, 1, 3),
+]
+
+for text, cmd, r, c in BUTTONS:
+    ttk.Button(btn2_frame, text=text, command=cmd, style="Ctl.TButton"
+               ).grid(row=r, column=c, padx=2)
+
+# two finger click on Mac, right-click on Windows/Linux, Ctrl+Click on Mac
+tree.event_add("<<ShowMenu>>", "<Button-2>", "<Button-3>", "<Control-Button-1>")
+tree.bind("<<ShowMenu>>", show_context_menu)
 
-# === Load Folder Button ===
-ttk.Button(btn2_frame, text="Add folder", command=lambda: add_folder(), width=BTN2_WIDTH
-           ).grid(row=0, column=0, padx=2)
-
-# === Add Songs Button ===
-ttk.Button(btn2_frame, text="Add songs", command=lambda: add_songs(), width=BTN2_WIDTH
-           ).grid(row=0, column=1, padx=2)
-
-# === Clear Button ===
-ttk.Button(btn2_frame, text="Delete", command=lambda: delete_current_song(), width=BTN2_WIDTH
-           ).grid(row=0, column=2, padx=2)
+# keyboard shortcuts for quick reordering
+root.bind_all("<Control-Up>", move_up_key)
+root.bind_all("<Control-Down>", move_down_key)
 
-# === Clear Button ===
-ttk.Button(btn2_frame, text="Clear", command=lambda: clear_songs_list(), width=BTN2_WIDTH
-           ).grid(row=0, column=3, padx=2)
+# === Sleep Listener ===
+# set while a <<SystemSleep>> event is queued but not yet handled
+sleep_event = threading.Event()
 
-# === Save Playlist Button ===
-ttk.Button(btn2_frame, text="Save playlist as...", command=save_playlist_as, width=BTN2_WIDTH
-           ).grid(row=1, column=0, padx=2)
+class SleepListener(NSObject):
+    def init(self):
+        self = objc.super(SleepListener, self).init()
+        if self is None:
+            return None
+        # registering twice would deliver every notification twice
+        self.started = False
+        self._nc = NSWorkspace.sharedWorkspace().notificationCenter()
+        self._sel = objc.selector(self.handleSleep_, signature=b'v@:@')
+        return self
 
-# === Load Playlist Button ===
-ttk.Button(btn2_frame, text="Load playlist...", command=load_playlist_from_file, width=BTN2_WIDTH
-           ).grid(row=1, column=1, padx=2)
+    def start(self):
+        if self.started:
+            return
+        try:
+            self._nc.addObserver_selector_name_object_(
+                self, self._sel, NSWorkspaceWillSleepNotification, None)
+            self.started = True
+        except Exception:
+            pass
 
-# === Move Up / Move Down Buttons ===
-ttk.Button(btn2_frame, text="Move up", command=lambda: move_selected_up(), width=BTN2_WIDTH
-           ).grid(row=1, column=2, padx=2)
-ttk.Button(btn2_frame, text="Move down", command=lambda: move_selected_down(), width=BTN2_WIDTH
-           ).grid(row=1, column=3, padx=2)
+    def stop(self):
+        if not self.started:
+            return
+        try:
+            self._nc.removeObserver_name_object_(
+                self, NSWorkspaceWillSleepNotification, None)
+            self.started = False
+        except Exception:
+            pass
 
+    def handleSleep_(self, notification):
+        # hand the notification to Tk's own event queue; mainloop delivers it.
+        # A burst of notifications before Tk gets to it collapses into one event.
+        if sleep_event.is_set():
+            return
+        sleep_event.set()
+        # this runs inside the Cocoa run loop that Tk is driving; an exception
+        # escaping here would unwind through mainloop, so never let one out
+        try:
+            root.event_generate("<<SystemSleep>>", when="tail")
+        except Exception:
+            sleep_event.clear()
 
-context_menu = tk.Menu(root, tearoff=0)
-context_menu.add_command(label="Delete from list", command=lambda: delete_current_song())
-context_menu.add_command(label="Move up", command=lambda: move_selected_up())
-context_menu.add_command(label="Move down", command=lambda: move_selected_down())
+# create instance but don't start automatically here
+sleep_listener = SleepListener.alloc().init()
 
-tree.bind("<Button-2>", show_context_menu)  # Two finger click on Mac
-tree.bind("<Button-3>", show_context_menu)  # Right-click on Windows/Linux
-tree.bind("<Control-Button-1>", show_context_menu)  # Ctrl+Click on Mac
+def pause_for_sleep(event=None):
+    """Pause playback when the system is about to sleep (never resume a paused song)."""
+    sleep_event.clear()
+    if player and not paused:
+        pause_song()
 
-# keyboard shortcuts for quick reordering
-root.bind_all("<Control-Up>", lambda e: move_selected_up())
-root.bind_all("<Control-Down>", lambda e: move_selected_down())
+# pause playback when the system is about to sleep
+root.bind("<<SystemSleep>>", pause_for_sleep)
 
 # --- Sleep listener checkbox ---
 sleep_listener_enabled = tk.BooleanVar(value=True)  # default checked
@@ -831,7 +1129,7 @@ def toggle_sleep_listener():
             pass
 
 ttk.Checkbutton(btn2_frame, text="Pause on sleep", variable=sleep_listener_enabled,
-                command=toggle_sleep_listener()).grid(row=1, column=4, padx=6)
+                command=toggle_sleep_listener).grid(row=1, column=4, padx=6)
 
 # start listener if default enabled
 if sleep_listener_enabled.get():
@@ -840,31 +1138,13 @@ if sleep_listener_enabled.get():
     except Exception:
         pass
 
-# === Sleep Listener ===
-class SleepListener(NSObject):
-    def init(self):
-        return self
-
-    def start(self):
-        try:
-            NSWorkspace.sharedWorkspace().notificationCenter().addObserver_selector_name_object_(
-                self, objc.selector(self.handleSleep_, signature=b'v@:@'),
-                "NSWorkspaceWillSleepNotification", None)
-        except Exception:
-            pass
-
-    def stop(self):
-        try:
-            NSWorkspace.sharedWorkspace().notificationCenter().removeObserver_name_object_(
-                self, "NSWorkspaceWillSleepNotification", None)
-        except Exception:
-            pass
-
-    def handleSleep_(self, notification):
-        pause_song()
+def on_close():
+    """Flush a pending playlist save before the window closes."""
+    if save_after_id is not None:
+        flush_playlist()
+    root.destroy()
 
-# create instance but don't start automatically here
-sleep_listener = SleepListener.alloc().init()
+root.protocol("WM_DELETE_WINDOW", on_close)
 
 # === Start ===
 load_saved_playlist()